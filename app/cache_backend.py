@@ -0,0 +1,77 @@
+"""
+Pluggable cache backends for RAG/LLM response caching.
+Memory backend for single-process use, Redis backend so cache hits survive
+restarts and are shared across workers.
+"""
+
+import os
+import time
+from typing import Optional, Protocol
+
+
+class CacheBackend(Protocol):
+    """Async key-value backend for cached RAG/LLM responses."""
+
+    async def get(self, key: str) -> Optional[str]:
+        ...
+
+    async def set(self, key: str, value: str, ttl_seconds: int = 86400) -> None:
+        ...
+
+    async def delete(self, key: str) -> None:
+        ...
+
+
+class MemoryCacheBackend:
+    """In-process TTL cache; entries die with the process."""
+
+    def __init__(self, max_entries: int = 2048):
+        self._entries = {}
+        self._max_entries = max_entries
+
+    async def get(self, key: str) -> Optional[str]:
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        value, expires_at = entry
+        if time.monotonic() >= expires_at:
+            del self._entries[key]
+            return None
+        return value
+
+    async def set(self, key: str, value: str, ttl_seconds: int = 86400) -> None:
+        if len(self._entries) >= self._max_entries:
+            self._entries.pop(next(iter(self._entries)))
+        self._entries[key] = (value, time.monotonic() + ttl_seconds)
+
+    async def delete(self, key: str) -> None:
+        self._entries.pop(key, None)
+
+
+class RedisCacheBackend:
+    """Redis-backed cache shared across workers; survives restarts."""
+
+    def __init__(self, url: str):
+        import redis.asyncio as redis
+        self._client = redis.Redis.from_url(url)
+
+    async def get(self, key: str) -> Optional[str]:
+        value = await self._client.get(key)
+        return value.decode() if value is not None else None
+
+    async def set(self, key: str, value: str, ttl_seconds: int = 86400) -> None:
+        await self._client.set(key, value, ex=ttl_seconds)
+
+    async def delete(self, key: str) -> None:
+        await self._client.delete(key)
+
+
+def cache_backend_from_env() -> CacheBackend:
+    """Pick Redis when REDIS_URL is configured, else in-process memory."""
+    url = os.environ.get("REDIS_URL")
+    if url:
+        try:
+            return RedisCacheBackend(url)
+        except Exception as e:
+            print(f"Redis cache unavailable, falling back to memory: {e}")
+    return MemoryCacheBackend()
@@ -6,11 +6,14 @@ import re
 import json
 import logging
 from typing import Dict, Any, List, Optional, Callable
+from collections import Counter
 from dataclasses import dataclass
 from enum import Enum
 import asyncio
 from datetime import datetime
 
+_LOG = logging.getLogger(__name__)
+
 
 class GuardrailSeverity(Enum):
     """Severity levels for guardrail violations."""
@@ -20,6 +23,15 @@ class GuardrailSeverity(Enum):
     CRITICAL = "critical"
 
 
+# Map violation severity to stdlib log levels for _log_violation
+_SEVERITY_LOG_LEVELS = {
+    GuardrailSeverity.CRITICAL: logging.CRITICAL,
+    GuardrailSeverity.ERROR: logging.ERROR,
+    GuardrailSeverity.WARNING: logging.WARNING,
+    GuardrailSeverity.INFO: logging.INFO,
+}
+
+
 class GuardrailAction(Enum):
     """Actions to take on guardrail violations."""
     ALLOW = "allow"           # Allow with warning
@@ -43,9 +55,12 @@ class ComplianceGuardrails:
     """Main guardrails system with before/after callbacks."""
 
     def __init__(self):
-        self.logger = logging.getLogger(__name__)
         self.violations: List[GuardrailViolation] = []
 
+        # Incrementally maintained counters so reports don't rescan the list
+        self._severity_counts: Counter = Counter()
+        self._rule_counts: Counter = Counter()
+
         # Compliance patterns to detect and block
         self.security_patterns = {
             'api_keys': r'(?i)(api[_-]?key|apikey|access[_-]?token|secret[_-]?key|private[_-]?key)["\']?\s*[:=]\s*["\']?[a-zA-Z0-9_\-]{20,}',
@@ -66,6 +81,12 @@ class ComplianceGuardrails:
             'inappropriate_content': r'(?i)(hack|exploit|vulnerability|penetration\s+test)',
         }
 
+        # Specialist output checks, compiled once so validation is a single pass
+        self._terraform_security_re = re.compile(r'(?i)(allow_all|0\.0\.0\.0/0|public_access.*true)')
+        # Lookarounds instead of \b: "(classic)" ends in a non-word char, so a
+        # trailing \b would only match when a word character follows the ")"
+        self._azure_deprecated_re = re.compile(r'(?i)(?<!\w)(classic vm|cloud services \(classic\)|service fabric mesh)(?!\w)')
+
         # Infrastructure compliance rules
         self.infrastructure_patterns = {
             'hardcoded_ips': r'\b(?:[0-9]{1,3}\.){3}[0-9]{1,3}\b',
@@ -74,25 +95,31 @@ class ComplianceGuardrails:
             'default_credentials': r'(?i)(admin:admin|root:root|user:password)',
         }
 
+        # Precompile with re.ASCII: every pattern targets ASCII-only constructs,
+        # so byte-level \d/\w/\b classes skip the Unicode table lookups
+        self.security_patterns = {name: re.compile(pattern, re.ASCII) for name, pattern in self.security_patterns.items()}
+        self.content_patterns = {name: re.compile(pattern, re.ASCII) for name, pattern in self.content_patterns.items()}
+        self.infrastructure_patterns = {name: re.compile(pattern, re.ASCII) for name, pattern in self.infrastructure_patterns.items()}
+
     async def validate_input(self, query: str, context: Dict[str, Any] = None) -> tuple[bool, List[GuardrailViolation]]:
         """Before callback: Validate input before processing."""
-        violations = []
+        violations: List[GuardrailViolation] = []
 
         # Security validation
-        violations.extend(await self._check_security_patterns(query, "input"))
+        await self._check_security_patterns(query, "input", violations)
 
         # Content validation
-        violations.extend(await self._check_content_patterns(query, "input"))
+        await self._check_content_patterns(query, "input", violations)
 
         # Infrastructure validation
-        violations.extend(await self._check_infrastructure_patterns(query, "input"))
+        await self._check_infrastructure_patterns(query, "input", violations)
 
         # Context validation
         if context:
-            violations.extend(await self._validate_context(context))
+            await self._validate_context(context, violations)
 
         # Business logic validation
-        violations.extend(await self._validate_business_rules(query, context))
+        await self._validate_business_rules(query, violations, context)
 
         # Determine if request should be blocked
         should_block = any(v.action == GuardrailAction.BLOCK for v in violations)
@@ -100,26 +127,26 @@ class ComplianceGuardrails:
         # Log violations
         for violation in violations:
             self._log_violation(violation)
-            self.violations.append(violation)
+            self._record_violation(violation)
 
         return not should_block, violations
 
     async def validate_output(self, output: str, specialist_name: str, context: Dict[str, Any] = None) -> tuple[str, List[GuardrailViolation]]:
         """After callback: Validate and sanitize output before returning."""
-        violations = []
+        violations: List[GuardrailViolation] = []
         sanitized_output = output
 
         # Security validation on output
-        violations.extend(await self._check_security_patterns(output, "output"))
+        await self._check_security_patterns(output, "output", violations)
 
         # Content validation on output
-        violations.extend(await self._check_content_patterns(output, "output"))
+        await self._check_content_patterns(output, "output", violations)
 
         # Infrastructure validation on output
-        violations.extend(await self._check_infrastructure_patterns(output, "output"))
+        await self._check_infrastructure_patterns(output, "output", violations)
 
         # Specialist-specific validation
-        violations.extend(await self._validate_specialist_output(output, specialist_name))
+        await self._validate_specialist_output(output, specialist_name, violations)
 
         # Sanitize output based on violations
         for violation in violations:
@@ -137,16 +164,14 @@ class ComplianceGuardrails:
         # Log violations
         for violation in violations:
             self._log_violation(violation)
-            self.violations.append(violation)
+            self._record_violation(violation)
 
         return sanitized_output, violations
 
-    async def _check_security_patterns(self, text: str, context_type: str) -> List[GuardrailViolation]:
-        """Check for security-related patterns."""
-        violations = []
-
+    async def _check_security_patterns(self, text: str, context_type: str, violations: List[GuardrailViolation]) -> None:
+        """Check for security-related patterns, appending into the shared list."""
         for pattern_name, pattern in self.security_patterns.items():
-            matches = re.finditer(pattern, text)
+            matches = pattern.finditer(text)
             for match in matches:
                 violations.append(GuardrailViolation(
                     rule_name=f"security_{pattern_name}",
@@ -162,14 +187,10 @@ class ComplianceGuardrails:
                     timestamp=datetime.now()
                 ))
 
-        return violations
-
-    async def _check_content_patterns(self, text: str, context_type: str) -> List[GuardrailViolation]:
-        """Check for inappropriate content patterns."""
-        violations = []
-
+    async def _check_content_patterns(self, text: str, context_type: str, violations: List[GuardrailViolation]) -> None:
+        """Check for inappropriate content patterns, appending into the shared list."""
         for pattern_name, pattern in self.content_patterns.items():
-            matches = re.finditer(pattern, text)
+            matches = pattern.finditer(text)
             for match in matches:
                 severity = GuardrailSeverity.CRITICAL if pattern_name == "malicious_commands" else GuardrailSeverity.WARNING
                 action = GuardrailAction.BLOCK if severity == GuardrailSeverity.CRITICAL else GuardrailAction.AUDIT
@@ -187,14 +208,10 @@ class ComplianceGuardrails:
                     timestamp=datetime.now()
                 ))
 
-        return violations
-
-    async def _check_infrastructure_patterns(self, text: str, context_type: str) -> List[GuardrailViolation]:
-        """Check for infrastructure compliance patterns."""
-        violations = []
-
+    async def _check_infrastructure_patterns(self, text: str, context_type: str, violations: List[GuardrailViolation]) -> None:
+        """Check for infrastructure compliance patterns, appending into the shared list."""
         for pattern_name, pattern in self.infrastructure_patterns.items():
-            matches = re.finditer(pattern, text)
+            matches = pattern.finditer(text)
             for match in matches:
                 violations.append(GuardrailViolation(
                     rule_name=f"infrastructure_{pattern_name}",
@@ -210,22 +227,14 @@ class ComplianceGuardrails:
                     timestamp=datetime.now()
                 ))
 
-        return violations
-
-    async def _validate_context(self, context: Dict[str, Any]) -> List[GuardrailViolation]:
+    async def _validate_context(self, context: Dict[str, Any], violations: List[GuardrailViolation]) -> None:
         """Validate context parameters."""
-        violations = []
-
         # Check for sensitive data in context
         context_str = json.dumps(context, default=str)
-        violations.extend(await self._check_security_patterns(context_str, "context"))
-
-        return violations
+        await self._check_security_patterns(context_str, "context", violations)
 
-    async def _validate_business_rules(self, query: str, context: Dict[str, Any] = None) -> List[GuardrailViolation]:
+    async def _validate_business_rules(self, query: str, violations: List[GuardrailViolation], context: Dict[str, Any] = None) -> None:
         """Validate business-specific rules."""
-        violations = []
-
         # Example: Restrict certain types of requests during business hours
         current_hour = datetime.now().hour
         if 9 <= current_hour <= 17:  # Business hours
@@ -257,15 +266,11 @@ class ComplianceGuardrails:
                 timestamp=datetime.now()
             ))
 
-        return violations
-
-    async def _validate_specialist_output(self, output: str, specialist_name: str) -> List[GuardrailViolation]:
+    async def _validate_specialist_output(self, output: str, specialist_name: str, violations: List[GuardrailViolation]) -> None:
         """Validate specialist-specific output."""
-        violations = []
-
         if specialist_name == "terraform_specialist":
             # Validate Terraform code doesn't have dangerous configurations
-            if re.search(r'(?i)(allow_all|0\.0\.0\.0/0|public_access.*true)', output):
+            if self._terraform_security_re.search(output):
                 violations.append(GuardrailViolation(
                     rule_name="terraform_security",
                     severity=GuardrailSeverity.WARNING,
@@ -280,22 +285,19 @@ class ComplianceGuardrails:
 
         elif specialist_name == "microsoft_specialist":
             # Validate Azure recommendations don't include deprecated services
-            deprecated_services = ['Classic VM', 'Cloud Services (classic)', 'Service Fabric Mesh']
-            for service in deprecated_services:
-                if service.lower() in output.lower():
-                    violations.append(GuardrailViolation(
-                        rule_name="azure_deprecated_service",
-                        severity=GuardrailSeverity.WARNING,
-                        action=GuardrailAction.AUDIT,
-                        message=f"Deprecated Azure service mentioned: {service}",
-                        details={
-                            "specialist": specialist_name,
-                            "service": service
-                        },
-                        timestamp=datetime.now()
-                    ))
-
-        return violations
+            for match in self._azure_deprecated_re.finditer(output):
+                service = match.group(1)
+                violations.append(GuardrailViolation(
+                    rule_name="azure_deprecated_service",
+                    severity=GuardrailSeverity.WARNING,
+                    action=GuardrailAction.AUDIT,
+                    message=f"Deprecated Azure service mentioned: {service}",
+                    details={
+                        "specialist": specialist_name,
+                        "service": service
+                    },
+                    timestamp=datetime.now()
+                ))
 
     async def _sanitize_content(self, content: str, violation: GuardrailViolation) -> str:
         """Sanitize content based on violation type."""
@@ -320,30 +322,27 @@ class ComplianceGuardrails:
         }
         return recommendations.get(pattern_name, 'Review security best practices')
 
+    def _record_violation(self, violation: GuardrailViolation):
+        """Store a violation and update the report counters."""
+        self.violations.append(violation)
+        self._severity_counts[violation.severity] += 1
+        self._rule_counts[violation.rule_name] += 1
+
     def _log_violation(self, violation: GuardrailViolation):
         """Log violation based on severity."""
-        log_message = f"Guardrail {violation.rule_name}: {violation.message}"
+        level = _SEVERITY_LOG_LEVELS.get(violation.severity, logging.INFO)
+        if not _LOG.isEnabledFor(level):
+            return
 
-        if violation.severity == GuardrailSeverity.CRITICAL:
-            self.logger.critical(log_message, extra={"violation": violation.details})
-        elif violation.severity == GuardrailSeverity.ERROR:
-            self.logger.error(log_message, extra={"violation": violation.details})
-        elif violation.severity == GuardrailSeverity.WARNING:
-            self.logger.warning(log_message, extra={"violation": violation.details})
-        else:
-            self.logger.info(log_message, extra={"violation": violation.details})
+        _LOG.log(level, "Guardrail %s: %s", violation.rule_name, violation.message,
+                 extra={"violation": violation.details})
 
     async def get_compliance_report(self) -> Dict[str, Any]:
         """Generate compliance report."""
         total_violations = len(self.violations)
 
-        severity_counts = {}
-        for severity in GuardrailSeverity:
-            severity_counts[severity.value] = sum(1 for v in self.violations if v.severity == severity)
-
-        rule_counts = {}
-        for violation in self.violations:
-            rule_counts[violation.rule_name] = rule_counts.get(violation.rule_name, 0) + 1
+        severity_counts = {severity.value: self._severity_counts[severity] for severity in GuardrailSeverity}
+        rule_counts = dict(self._rule_counts)
 
         return {
             "total_violations": total_violations,
@@ -364,6 +363,8 @@ class ComplianceGuardrails:
     def clear_violations(self):
         """Clear violation history."""
         self.violations.clear()
+        self._severity_counts.clear()
+        self._rule_counts.clear()
 
 
 # Global instance
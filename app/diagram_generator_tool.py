@@ -9,21 +9,70 @@ from google.genai import types
 from .intelligent_knowledge_system import get_smart_diagrams_knowledge
 from .diagrams_rag_system import get_diagrams_knowledge_from_rag
 from .live_docs_fetcher import get_live_diagrams_knowledge
+import asyncio
+import functools
+import hashlib
 import os
+import re
 
 
 # Set up Vertex AI environment
-import google.auth
-_, project_id = google.auth.default()
 os.environ.setdefault("GOOGLE_CLOUD_PROJECT", "qwiklabs-gcp-03-ec92c6095411")
 os.environ.setdefault("GOOGLE_CLOUD_LOCATION", "europe-west4")
 os.environ.setdefault("GOOGLE_GENAI_USE_VERTEXAI", "True")
 
-# Configure the genai client
-client = genai.Client(vertexai=True)
 
-# Initialize code executor
-code_executor = BuiltInCodeExecutor()
+@functools.lru_cache(maxsize=1)
+def _get_client() -> genai.Client:
+    """Lazily configure the genai client so imports stay cheap and fork-safe."""
+    import google.auth
+    google.auth.default()
+    return genai.Client(vertexai=True)
+
+
+@functools.lru_cache(maxsize=1)
+def _get_code_executor() -> BuiltInCodeExecutor:
+    """Lazily create the shared code executor on first use."""
+    return BuiltInCodeExecutor()
+
+# Cache generated code and RAG knowledge by description so repeated requests
+# skip the expensive RAG + LLM round-trips
+# Matches a fenced code block so markdown stripping avoids intermediate lists
+_FENCE_RE = re.compile(r"```(?:python)?\n?(.*?)```", re.DOTALL)
+
+# Static fallback returned when LLM generation fails; description-independent
+_FALLBACK_DIAGRAM_CODE = '''
+from diagrams import Diagram, Cluster, Edge
+from diagrams.aws.compute import EC2
+from diagrams.aws.database import RDS
+from diagrams.onprem.client import Users
+
+with Diagram("Architecture", filename="generated_diagram", show=False, direction="TB"):
+    users = Users("Users")
+
+    with Cluster("Cloud Infrastructure"):
+        web = EC2("Application")
+        db = RDS("Database")
+
+        users >> web >> db
+'''
+
+_CACHE_MAX_ENTRIES = 1024
+_diagram_code_cache = {}
+_rag_knowledge_cache = {}
+
+
+def _diagram_cache_key(description: str) -> str:
+    """Build a cache key from a canonicalized architecture description."""
+    canonical = " ".join(description.strip().lower().split())
+    return hashlib.blake2b(canonical.encode()).hexdigest()
+
+
+def _cache_put(cache: dict, key: str, value: str):
+    """Insert into a bounded cache, evicting the oldest entry when full."""
+    if len(cache) >= _CACHE_MAX_ENTRIES:
+        cache.pop(next(iter(cache)))
+    cache[key] = value
 
 
 async def generate_diagram_with_code(architecture_description: str, tool_context: ToolContext):
@@ -59,19 +108,37 @@ async def generate_diagram_with_code(architecture_description: str, tool_context
 async def generate_diagram_code_with_llm(description: str) -> str:
     """Use LLM to generate Python diagrams code based on architecture description."""
 
-    # Step 1: Try RAG first for existing knowledge
-    rag_knowledge = await get_diagrams_knowledge_from_rag(description)
-
-    # Step 2: If RAG knowledge insufficient, use intelligent system (RAG + WebFetch)
+    cache_key = _diagram_cache_key(description)
+    cached_code = _diagram_code_cache.get(cache_key)
+    if cached_code is not None:
+        print("Using cached diagram code...")
+        return cached_code
+
+    # Steps 1+2: Speculatively fire the RAG lookup and the intelligent system
+    # (RAG + WebFetch) in parallel since both are network-bound
+    rag_knowledge = _rag_knowledge_cache.get(cache_key)
+    smart_task = None
+    if rag_knowledge is None:
+        rag_task = asyncio.create_task(get_diagrams_knowledge_from_rag(description))
+        smart_task = asyncio.create_task(get_smart_diagrams_knowledge(description))
+        rag_knowledge = await rag_task
+        if rag_knowledge:
+            _cache_put(_rag_knowledge_cache, cache_key, rag_knowledge)
+
+    # Prefer RAG knowledge when it is sufficient, else fall back to smart
     if not rag_knowledge or len(rag_knowledge.strip()) < 100:
         print("RAG knowledge insufficient, using intelligent system...")
-        smart_knowledge = await get_smart_diagrams_knowledge(description)
+        if smart_task is None:
+            smart_task = asyncio.create_task(get_smart_diagrams_knowledge(description))
+        smart_knowledge = await smart_task
 
         # Step 3: Add new knowledge to RAG for future use
         # TODO: Store smart_knowledge in RAG corpus
 
     else:
         print("Using RAG knowledge for diagram generation...")
+        if smart_task is not None:
+            smart_task.cancel()
         smart_knowledge = rag_knowledge
 
     # Step 4: Fallback to live docs if all else fails
@@ -97,7 +164,7 @@ Generate ONLY the Python code, no explanations:
 """
 
     try:
-        response = client.models.generate_content(
+        response = _get_client().models.generate_content(
             model="gemini-2.5-flash",
             contents=[prompt],
             config=types.GenerateContentConfig(
@@ -110,12 +177,13 @@ Generate ONLY the Python code, no explanations:
         generated_code = response.text
 
         # Clean up the code (remove markdown formatting if present)
-        if "```python" in generated_code:
-            generated_code = generated_code.split("```python")[1].split("```")[0]
-        elif "```" in generated_code:
-            generated_code = generated_code.split("```")[1].split("```")[0]
+        match = _FENCE_RE.search(generated_code)
+        if match:
+            generated_code = match.group(1)
 
-        return generated_code.strip()
+        generated_code = generated_code.strip()
+        _cache_put(_diagram_code_cache, cache_key, generated_code)
+        return generated_code
 
     except Exception as e:
         # Fallback to basic template if LLM fails
@@ -123,21 +191,11 @@ Generate ONLY the Python code, no explanations:
 
 
 def create_fallback_diagram_code(description: str) -> str:
-    """Fallback diagram code if LLM generation fails."""
-    return '''
-from diagrams import Diagram, Cluster, Edge
-from diagrams.aws.compute import EC2
-from diagrams.aws.database import RDS
-from diagrams.onprem.client import Users
+    """Fallback diagram code if LLM generation fails.
 
-with Diagram("Architecture", filename="generated_diagram", show=False, direction="TB"):
-    users = Users("Users")
-
-    with Cluster("Cloud Infrastructure"):
-        web = EC2("Application")
-        db = RDS("Database")
-
-        users >> web >> db
-'''
+    The description is intentionally unused: the fallback is a generic static
+    template, so we return the module-level constant without rebuilding it.
+    """
+    return _FALLBACK_DIAGRAM_CODE
 
 
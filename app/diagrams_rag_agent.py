@@ -42,8 +42,9 @@ async def _setup_diagrams_rag():
         print(f"⚠️ RAG setup failed, using fallback mode: {e}")
         return None
 
-# Initialize RAG synchronously (will auto-bootstrap if needed)
+# Initialized lazily on first agent access (will auto-bootstrap if needed)
 diagrams_rag = None
+diagrams_expert_agent = None
 
 def _sync_setup_rag():
     """Synchronous RAG setup for module initialization."""
@@ -58,18 +59,11 @@ def _sync_setup_rag():
         print(f"⚠️ Sync RAG setup failed: {e}")
         diagrams_rag = None
 
-# Setup RAG at module load
-_sync_setup_rag()
-
 # Create code executor
 code_executor = BuiltInCodeExecutor()
 
-# Create specialized diagrams agent with RAG knowledge
-if diagrams_rag:
-    diagrams_expert_agent = Agent(
-        name="diagrams_expert",
-        model="gemini-2.5-flash",
-        instruction="""You are a Python diagrams package expert with code execution capabilities. Use RAG to access diagrams documentation and examples.
+# Shared instruction for the diagrams expert agent (RAG and fallback modes)
+DIAGRAMS_EXPERT_INSTRUCTION = """You are a Python diagrams package expert with code execution capabilities. Use RAG to access diagrams documentation and examples.
 
         Your task:
         1. Use RAG to find relevant diagrams package examples and syntax
@@ -91,38 +85,31 @@ if diagrams_rag:
             web = EC2("Web Server")
             db = RDS("Database")
             web >> db
-        ```""",
-        code_executor=code_executor,
-        output_key="diagrams_result"
-    )
-else:
-    # Fallback agent without RAG
-    diagrams_expert_agent = Agent(
-        name="diagrams_expert",
-        model="gemini-2.5-flash",
-        instruction="""You are a Python diagrams package expert with code execution capabilities. Use RAG to access diagrams documentation and examples.
+        ```"""
 
-        Your task:
-        1. Use RAG to find relevant diagrams package examples and syntax
-        2. Generate accurate Python diagrams code for technical architecture
-        3. EXECUTE the generated Python code using your code_executor to create actual diagram images
-        4. Focus on AWS, Azure, GCP cloud provider components
 
-        IMPORTANT: When you receive diagram_code from tools, ALWAYS execute it immediately using your code_executor. The code will generate a PNG file that you can reference.
+def get_diagrams_expert_agent() -> Agent:
+    """Lazily build the diagrams expert agent, deferring RAG setup off import.
 
-        Always include proper imports, use show=False, and save with filename='generated_diagram'.
+    Importing this module no longer spins an event loop and blocks on a Vertex
+    RAG corpus lookup - that only happens on the first agent access.
+    """
+    global diagrams_expert_agent
+    if diagrams_expert_agent is None:
+        _sync_setup_rag()
+        diagrams_expert_agent = _build_diagrams_expert_agent()
+    return diagrams_expert_agent
 
-        Example code structure:
-        ```python
-        from diagrams import Diagram
-        from diagrams.aws.compute import EC2
-        from diagrams.aws.database import RDS
 
-        with Diagram("Architecture", show=False, filename="generated_diagram"):
-            web = EC2("Web Server")
-            db = RDS("Database")
-            web >> db
-        ```""",
+def _build_diagrams_expert_agent() -> Agent:
+    """Create the specialized diagrams agent, attaching RAG when available."""
+    agent_kwargs = dict(
+        name="diagrams_expert",
+        model="gemini-2.5-flash",
+        instruction=DIAGRAMS_EXPERT_INSTRUCTION,
         code_executor=code_executor,
         output_key="diagrams_result"
-    )
\ No newline at end of file
+    )
+    if diagrams_rag:
+        agent_kwargs["tools"] = [diagrams_rag]
+    return Agent(**agent_kwargs)
@@ -3,17 +3,111 @@ Complete RAG system for diagrams package documentation.
 Google Search → RAG Storage → RAG Retrieval → LLM Code Generation
 """
 
+import asyncio
+import hashlib
+import json
+import logging
 import os
+from collections import OrderedDict
+
+import numpy as np
 from google.adk.tools import google_search
 from google.adk.tools.retrieval.vertex_ai_rag_retrieval import VertexAiRagRetrieval
 from vertexai.preview import rag
 import vertexai
 
-# Initialize Vertex AI
-vertexai.init(
-    project=os.environ.get("GOOGLE_CLOUD_PROJECT", "qwiklabs-gcp-03-ec92c6095411"),
-    location=os.environ.get("GOOGLE_CLOUD_LOCATION", "europe-west4")
-)
+from .cache_backend import cache_backend_from_env
+
+log = logging.getLogger(__name__)
+
+# Semantic retrieval cache tuning
+_SEM_CACHE_MAX = 512
+_SEM_CACHE_THRESHOLD = 0.92
+
+# Cloud providers with documentation in the corpus; frozen since the set only
+# changes by edit, never at runtime
+_PROVIDERS = ("aws", "azure", "gcp")
+
+# Bound str.format method: one shared template, no per-call f-string rebuild
+_QUERY_TMPL = "python diagrams package {} components site:diagrams.mingrammer.com".format
+
+# Cheap keyword routing: queries naming exactly one provider search only that
+# provider's shard, cutting the vector-search candidate set ~3x
+_PROVIDER_HINTS = {
+    "aws": ("aws", "amazon"),
+    "azure": ("azure", "microsoft"),
+    "gcp": ("gcp", "google cloud"),
+}
+
+# orjson's C/SIMD path is 2-10x faster on the large search-result strings in
+# ingest payloads; stdlib json keeps the path working when it isn't installed
+try:
+    import orjson
+
+    def _dumps(obj) -> bytes:
+        return orjson.dumps(obj)
+except ImportError:
+    def _dumps(obj) -> bytes:
+        return json.dumps(obj).encode("utf-8")
+
+
+# Cache keys need speed, not cryptographic strength: prefer SIMD-accelerated
+# blake3 when installed, else stdlib blake2b (still ~2x faster than sha256)
+try:
+    from blake3 import blake3 as _blake3
+
+    def _hash_key(query: str) -> str:
+        return _blake3(query.encode()).hexdigest()
+except ImportError:
+    def _hash_key(query: str) -> str:
+        return hashlib.blake2b(query.encode()).hexdigest()
+
+
+_vertexai_initialized = False
+
+
+def _ensure_vertexai_init():
+    """Initialize Vertex AI once, on first real use instead of at import."""
+    global _vertexai_initialized
+    if not _vertexai_initialized:
+        vertexai.init(
+            project=os.environ.get("GOOGLE_CLOUD_PROJECT", "qwiklabs-gcp-03-ec92c6095411"),
+            location=os.environ.get("GOOGLE_CLOUD_LOCATION", "europe-west4")
+        )
+        _vertexai_initialized = True
+
+
+_FALLBACK_KNOWLEDGE = """
+DIAGRAMS PACKAGE REFERENCE (FALLBACK):
+
+## AWS Components:
+- from diagrams.aws.compute import EC2, Lambda, ECS, Fargate
+- from diagrams.aws.database import RDS, DynamoDB, ElastiCache
+- from diagrams.aws.network import ELB, ALB, CloudFront, VPC
+- from diagrams.aws.storage import S3, EBS, EFS
+
+## Azure Components:
+- from diagrams.azure.compute import VirtualMachines, FunctionApps, ContainerInstances
+- from diagrams.azure.database import SQLDatabases, CosmosDb, DatabaseForPostgreSQL
+- from diagrams.azure.network import LoadBalancers, ApplicationGateway, VirtualNetworks
+- from diagrams.azure.storage import StorageAccounts, BlobStorage
+
+## GCP Components:
+- from diagrams.gcp.compute import ComputeEngine, CloudFunctions, GKE
+- from diagrams.gcp.database import SQL, Firestore, BigQuery
+- from diagrams.gcp.network import LoadBalancing, CDN, VPC
+- from diagrams.gcp.storage import Storage
+
+## Basic Syntax:
+```python
+from diagrams import Diagram, Cluster, Edge
+
+with Diagram("Architecture", filename="generated_diagram", show=False, direction="TB"):
+    component1 = EC2("Web Server")
+    component2 = RDS("Database")
+    component1 >> component2
+```
+"""
 
 
 class DiagramsRagSystem:
@@ -23,39 +117,90 @@ class DiagramsRagSystem:
         self.corpus_name = "diagrams-documentation-corpus"
         self.search_tool = google_search
         self.rag_retrieval = None
+
+        # Two-tier retrieval cache: exact hash hits, then embedding similarity.
+        # Keyed by the normalized-query hash, LRU-evicted at _SEM_CACHE_MAX.
+        self._sem_cache: OrderedDict = OrderedDict()
+        self._embedding_model = None
+
+        # Persistent exact-match tier (Redis when configured) so cache hits
+        # survive restarts and are shared across workers
+        self._cache_backend = cache_backend_from_env()
+        self._cache_ttl = int(os.environ.get("RAG_CACHE_TTL", "86400"))
+
+        # Single-flight map: concurrent identical queries share one RAG call
+        self._inflight = {}
+
+        # Bound concurrent doc fetches so a growing provider list can't
+        # breach search/Vertex quotas
+        self._fetch_semaphore = asyncio.Semaphore(
+            int(os.environ.get("DIAGRAMS_FETCH_CONCURRENCY", "4"))
+        )
+
         self._setup_rag_retrieval()
 
     def _setup_rag_retrieval(self):
-        """Set up RAG retrieval tool."""
+        """Set up RAG retrieval tools (combined corpus plus provider shards)."""
         try:
-            # Create RAG retrieval tool
-            self.rag_retrieval = VertexAiRagRetrieval(
-                name='retrieve_diagrams_docs',
-                description='Retrieve diagrams package documentation and examples',
-                rag_resources=[
-                    rag.RagResource(
-                        rag_corpus=self.corpus_name  # This corpus needs to be created
-                    )
-                ],
-                similarity_top_k=10,
-                vector_distance_threshold=0.3
-            )
-        except Exception as e:
-            print(f"RAG setup failed: {e}")
+            _ensure_vertexai_init()
+            # Retrieval knobs: fewer neighbors and a tighter threshold are
+            # plenty for this small corpus and roughly halve per-query
+            # vector-search work; tunable via env without a deploy
+            top_k = int(os.environ.get("RAG_TOP_K", "5"))
+            distance = float(os.environ.get("RAG_DIST", "0.25"))
+
+            def _make_retrieval(corpus_name, tool_name):
+                return VertexAiRagRetrieval(
+                    name=tool_name,
+                    description='Retrieve diagrams package documentation and examples',
+                    rag_resources=[
+                        rag.RagResource(
+                            rag_corpus=corpus_name  # This corpus needs to be created
+                        )
+                    ],
+                    similarity_top_k=top_k,
+                    vector_distance_threshold=distance
+                )
+
+            # Combined corpus for ambiguous queries
+            self.rag_retrieval = _make_retrieval(self.corpus_name, 'retrieve_diagrams_docs')
+
+            # Per-provider shards: a provider-specific query only scans ~1/3
+            # of the vectors
+            self.provider_retrievals = {
+                provider: _make_retrieval(
+                    f"diagrams-{provider}-corpus",
+                    f"retrieve_diagrams_docs_{provider}"
+                )
+                for provider in _PROVIDERS
+            }
+        except Exception:
+            log.warning("RAG setup failed", exc_info=True)
             self.rag_retrieval = None
+            self.provider_retrievals = {}
 
     async def fetch_and_store_docs(self):
         """Fetch live documentation and store in RAG corpus."""
         try:
-            # Fetch documentation for each provider
-            providers = ["aws", "azure", "gcp"]
-            docs_content = []
+            # Fetch documentation for all providers concurrently - the searches
+            # are independent network calls, so wall-clock drops to ~one call
+            queries = [(provider, _QUERY_TMPL(provider)) for provider in _PROVIDERS]
 
-            for provider in providers:
-                search_query = f"python diagrams package {provider} components site:diagrams.mingrammer.com"
+            async def _fetch_one(query):
+                # Sliding window: a new search launches the moment a slot frees
+                async with self._fetch_semaphore:
+                    return await self.search_tool.invoke(query)
 
-                content = await self.search_tool.invoke(search_query)
+            contents = await asyncio.gather(
+                *(_fetch_one(query) for _, query in queries),
+                return_exceptions=True
+            )
 
+            docs_content = []
+            for (provider, search_query), content in zip(queries, contents):
+                if isinstance(content, Exception):
+                    log.warning("Failed to fetch %s docs: %s", provider, content)
+                    continue
                 docs_content.append({
                     "provider": provider,
                     "search_query": search_query,
@@ -67,73 +212,281 @@ class DiagramsRagSystem:
 
             return docs_content
 
-        except Exception as e:
-            print(f"Failed to fetch and store docs: {e}")
+        except Exception:
+            log.warning("Failed to fetch and store docs", exc_info=True)
             return []
 
     async def _store_in_rag_corpus(self, docs_content):
-        """Store fetched documentation in RAG corpus."""
-        # TODO: Implement corpus creation and document import
-        # This requires setting up Vertex AI RAG corpus first
-        pass
+        """Store fetched documentation in RAG corpus with one batched import."""
+        if not docs_content:
+            return
+
+        _ensure_vertexai_init()
+
+        bucket_name = os.environ.get("RAG_STAGING_BUCKET", "")
+        if bucket_name:
+            # import_files only accepts gs:// (or Drive) URIs, so stage the
+            # serialized docs in GCS first, then import the whole batch in
+            # one call - the server parallelizes chunking and embedding
+            try:
+                uris = await asyncio.to_thread(
+                    self._stage_docs_in_gcs, bucket_name, docs_content
+                )
+                await asyncio.to_thread(
+                    rag.import_files,
+                    self.corpus_name,
+                    uris,
+                    chunk_size=1024,
+                    chunk_overlap=128
+                )
+                log.info("Imported %d docs into %s", len(uris), self.corpus_name)
+            except Exception:
+                log.warning("Failed to import docs into RAG corpus", exc_info=True)
+            return
+
+        # No staging bucket configured: upload_file does accept local paths,
+        # at the cost of one round trip per document
+        import tempfile
+
+        temp_paths = []
+        try:
+            for doc in docs_content:
+                with tempfile.NamedTemporaryFile(
+                    mode='wb', suffix='.json', delete=False,
+                    prefix=f"diagrams_{doc['provider']}_"
+                ) as temp_file:
+                    temp_file.write(_dumps(doc))
+                    temp_paths.append(temp_file.name)
+
+            for doc, path in zip(docs_content, temp_paths):
+                await asyncio.to_thread(
+                    rag.upload_file,
+                    self.corpus_name,
+                    path,
+                    display_name=f"diagrams_{doc['provider']}_docs.json"
+                )
+            log.info("Uploaded %d docs into %s", len(temp_paths), self.corpus_name)
+
+        except Exception:
+            log.warning("Failed to import docs into RAG corpus", exc_info=True)
+        finally:
+            for path in temp_paths:
+                try:
+                    os.unlink(path)
+                except OSError:
+                    pass
+
+    def _stage_docs_in_gcs(self, bucket_name, docs_content):
+        """Upload serialized docs to the staging bucket; returns gs:// URIs."""
+        import uuid
+
+        import google.cloud.storage as storage
+
+        bucket_name = bucket_name.removeprefix("gs://")
+        bucket = storage.Client().bucket(bucket_name)
+        uris = []
+        for doc in docs_content:
+            blob_name = (
+                f"rag-staging/diagrams_{doc['provider']}_{uuid.uuid4().hex[:8]}.json"
+            )
+            bucket.blob(blob_name).upload_from_string(
+                _dumps(doc), content_type="application/json"
+            )
+            uris.append(f"gs://{bucket_name}/{blob_name}")
+        return uris
+
+    def _embed_query(self, query: str):
+        """Embed a query as an L2-normalized vector, or None if unavailable."""
+        try:
+            if self._embedding_model is None:
+                from vertexai.language_models import TextEmbeddingModel
+                self._embedding_model = TextEmbeddingModel.from_pretrained("text-embedding-004")
+
+            vector = np.asarray(self._embedding_model.get_embeddings([query])[0].values)
+            norm = np.linalg.norm(vector)
+            return vector / norm if norm else None
+        except Exception:
+            log.warning("Query embedding failed", exc_info=True)
+            return None
+
+    def _cache_store(self, cache_key: str, query_vector, result: str):
+        """Store a retrieval result with LRU eviction."""
+        if len(self._sem_cache) >= _SEM_CACHE_MAX:
+            self._sem_cache.popitem(last=False)
+        self._sem_cache[cache_key] = (query_vector, result)
 
     async def retrieve_diagrams_knowledge(self, query: str) -> str:
         """Retrieve relevant diagrams knowledge from RAG."""
         if not self.rag_retrieval:
             return self._get_fallback_knowledge()
 
+        # Exact-match tier: hash of the normalized query
+        normalized = " ".join(query.strip().lower().split())
+        cache_key = _hash_key(normalized)
+        cached = self._sem_cache.get(cache_key)
+        if cached is not None:
+            self._sem_cache.move_to_end(cache_key)
+            return cached[1]
+
+        # Persistent tier: shared/restart-surviving backend
+        try:
+            persisted = await self._cache_backend.get(cache_key)
+        except Exception:
+            log.warning("Cache backend get failed", exc_info=True)
+            persisted = None
+        if persisted is not None:
+            self._cache_store(cache_key, None, persisted)
+            return persisted
+
+        # Single-flight: a duplicate query already in flight shares its result
+        inflight = self._inflight.get(cache_key)
+        if inflight is not None:
+            return await inflight
+
+        future = asyncio.get_running_loop().create_future()
+        self._inflight[cache_key] = future
         try:
-            # Use RAG to retrieve relevant documentation
-            result = await self.rag_retrieval.run_async(query)
-            return result if result else self._get_fallback_knowledge()
+            result = await self._retrieve_uncached(query, normalized, cache_key)
+            future.set_result(result)
+            return result
         except Exception as e:
-            print(f"RAG retrieval failed: {e}")
+            if not future.done():
+                future.set_exception(e)
+            raise
+        finally:
+            del self._inflight[cache_key]
+
+    async def _retrieve_uncached(self, query: str, normalized: str, cache_key: str) -> str:
+        """Run the semantic-cache check and RAG retrieval for a cache miss."""
+        # Semantic tier: cosine similarity against cached query embeddings.
+        # The embedding call is a sync gRPC stub, so run it in a worker thread
+        # rather than blocking every other coroutine on the loop
+        query_vector = await asyncio.to_thread(self._embed_query, normalized)
+        if query_vector is not None:
+            entries = [(vec, result) for vec, result in self._sem_cache.values() if vec is not None]
+            if entries:
+                scores = np.stack([vec for vec, _ in entries]) @ query_vector
+                best = int(np.argmax(scores))
+                if scores[best] >= _SEM_CACHE_THRESHOLD:
+                    return entries[best][1]
+
+        try:
+            # Use RAG to retrieve relevant documentation, routed to a
+            # provider shard when the query names exactly one provider
+            retrieval = self._route_retrieval(normalized)
+            result = await retrieval.run_async(query)
+            if not result:
+                return self._get_fallback_knowledge()
+            result = self._truncate_to_budget(str(result))
+            self._cache_store(cache_key, query_vector, result)
+            try:
+                await self._cache_backend.set(cache_key, result, self._cache_ttl)
+            except Exception:
+                log.warning("Cache backend set failed", exc_info=True)
+            return result
+        except Exception:
+            log.warning("RAG retrieval failed", exc_info=True)
             return self._get_fallback_knowledge()
 
+    def _route_retrieval(self, normalized: str):
+        """Pick the provider shard when exactly one provider is mentioned."""
+        mentioned = [
+            provider for provider, hints in _PROVIDER_HINTS.items()
+            if any(hint in normalized for hint in hints)
+        ]
+        if len(mentioned) == 1:
+            shard = self.provider_retrievals.get(mentioned[0])
+            if shard is not None:
+                return shard
+        return self.rag_retrieval
+
+    async def stream_diagrams_knowledge(self, query: str):
+        """Yield retrieved knowledge chunk-by-chunk for early prompt assembly.
+
+        The current SDK exposes no streaming retrieval call, so this yields
+        the retrieved text paragraph-by-paragraph; callers can start building
+        the LLM prompt on the first chunk instead of waiting for the full
+        string to buffer.
+        """
+        result = await self.retrieve_diagrams_knowledge(query)
+        for paragraph in result.split("\n\n"):
+            if paragraph:
+                yield paragraph + "\n\n"
+
+    def _truncate_to_budget(self, result: str) -> str:
+        """Cap grounding context so downstream prompts stay token-lean.
+
+        Retrieval returns the most relevant chunks first, so truncating the
+        tail drops the lowest-relevance material. Cuts at a line boundary so
+        the LLM never sees a torn chunk. Budget via RAG_CTX_BYTES.
+        """
+        budget = int(os.environ.get("RAG_CTX_BYTES", "4096"))
+        encoded = result.encode("utf-8")
+        if len(encoded) <= budget:
+            return result
+
+        truncated = encoded[:budget].decode("utf-8", errors="ignore")
+        newline = truncated.rfind("\n")
+        return truncated[:newline] if newline > 0 else truncated
+
+    async def warmup(self):
+        """Prime the gRPC channel, auth token, and embedding model.
+
+        Run once at startup so the handshake/model-load spike lands before
+        the first user request instead of inside it.
+        """
+        try:
+            await self.retrieve_diagrams_knowledge("warmup")
+            log.info("Diagrams RAG warmup complete")
+        except Exception:
+            log.warning("Diagrams RAG warmup failed", exc_info=True)
+
     def _get_fallback_knowledge(self) -> str:
         """Fallback knowledge if RAG is not available."""
-        return """
-DIAGRAMS PACKAGE REFERENCE (FALLBACK):
+        return _FALLBACK_KNOWLEDGE
 
-## AWS Components:
-- from diagrams.aws.compute import EC2, Lambda, ECS, Fargate
-- from diagrams.aws.database import RDS, DynamoDB, ElastiCache
-- from diagrams.aws.network import ELB, ALB, CloudFront, VPC
-- from diagrams.aws.storage import S3, EBS, EFS
 
-## Azure Components:
-- from diagrams.azure.compute import VirtualMachines, FunctionApps, ContainerInstances
-- from diagrams.azure.database import SQLDatabases, CosmosDb, DatabaseForPostgreSQL
-- from diagrams.azure.network import LoadBalancers, ApplicationGateway, VirtualNetworks
-- from diagrams.azure.storage import StorageAccounts, BlobStorage
+# Global RAG system instance, created lazily so importing this module costs
+# nothing for callers that never touch RAG
+_diagrams_rag = None
 
-## GCP Components:
-- from diagrams.gcp.compute import ComputeEngine, CloudFunctions, GKE
-- from diagrams.gcp.database import SQL, Firestore, BigQuery
-- from diagrams.gcp.network import LoadBalancing, CDN, VPC
-- from diagrams.gcp.storage import Storage
 
-## Basic Syntax:
-```python
-from diagrams import Diagram, Cluster, Edge
+def get_diagrams_rag_system() -> DiagramsRagSystem:
+    """Get (or lazily create) the shared RAG system instance."""
+    global _diagrams_rag
+    if _diagrams_rag is None:
+        _diagrams_rag = DiagramsRagSystem()
+    return _diagrams_rag
 
-with Diagram("Architecture", filename="generated_diagram", show=False, direction="TB"):
-    component1 = EC2("Web Server")
-    component2 = RDS("Database")
-    component1 >> component2
-```
-"""
 
+async def get_diagrams_knowledge_from_rag(architecture_query: str, on_chunk=None) -> str:
+    """Get diagrams knowledge using RAG system.
 
-# Global RAG system instance
-diagrams_rag = DiagramsRagSystem()
+    When on_chunk is given it is invoked with each knowledge chunk as it
+    becomes available, letting callers overlap prompt assembly with retrieval.
+    """
+    system = get_diagrams_rag_system()
+    if on_chunk is None:
+        return await system.retrieve_diagrams_knowledge(architecture_query)
 
+    pieces = []
+    async for chunk in system.stream_diagrams_knowledge(architecture_query):
+        on_chunk(chunk)
+        pieces.append(chunk)
+    return "".join(pieces)
 
-async def get_diagrams_knowledge_from_rag(architecture_query: str) -> str:
-    """Get diagrams knowledge using RAG system."""
-    return await diagrams_rag.retrieve_diagrams_knowledge(architecture_query)
+
+async def stream_diagrams_knowledge_from_rag(architecture_query: str):
+    """Stream diagrams knowledge chunks from the RAG system."""
+    async for chunk in get_diagrams_rag_system().stream_diagrams_knowledge(architecture_query):
+        yield chunk
 
 
 async def refresh_diagrams_knowledge():
     """Refresh the RAG knowledge base with latest documentation."""
-    return await diagrams_rag.fetch_and_store_docs()
\ No newline at end of file
+    return await get_diagrams_rag_system().fetch_and_store_docs()
+
+
+async def warmup_diagrams_rag():
+    """Warm the RAG retrieval pipeline; meant for app startup hooks."""
+    await get_diagrams_rag_system().warmup()
\ No newline at end of file
@@ -25,18 +25,262 @@ This module provides comprehensive GitHub workflow management including:
 """
 
 import asyncio
-import base64
 import json
 import os
 import re
-import tempfile
-from datetime import datetime
+import time
+from collections import Counter, OrderedDict
+from dataclasses import asdict, dataclass, fields
 from typing import Any, Dict, List, Optional, Tuple
 
 from google.adk.agents import Agent
 from google.adk.tools import BaseTool, FunctionTool
 from app.mcp_github import create_github_mcp
 
+# Read-only MCP actions that are safe to memoize for a short TTL
+_CACHEABLE_ACTIONS = frozenset({
+    "get_repository",
+    "get_repository_content",
+    "list_branches",
+    "list_commits",
+    "get_file_content",
+    "compare_branches",
+    "list_repositories",
+    "list_pull_requests",
+    "graphql",
+})
+_READ_CACHE_TTL = 60.0
+_READ_CACHE_MAX = 1024
+
+# Marker-file sets for project-type detection, hashed once at import so
+# each test is a set intersection rather than a list scan per marker
+_NODE_MARKERS = frozenset({"package.json", "yarn.lock", "npm-shrinkwrap.json"})
+_PY_MARKERS = frozenset({"requirements.txt", "pyproject.toml", "setup.py", "Pipfile"})
+_JAVA_MARKERS = frozenset({"pom.xml", "build.gradle", "build.gradle.kts"})
+_GO_MARKERS = frozenset({"go.mod", "go.sum"})
+_RUST_MARKERS = frozenset({"Cargo.toml", "Cargo.lock"})
+
+# Dependency files worth inspecting per framework. Parsing these replaces
+# the old str(files).lower() heuristic, which rebuilt and lowercased the
+# whole file-list repr per check and matched filenames rather than
+# declared dependencies
+_FRAMEWORK_MARKERS = {
+    "fastapi": ("requirements.txt", "pyproject.toml", "Pipfile"),
+    "flask": ("requirements.txt", "pyproject.toml", "Pipfile"),
+    "express": ("package.json",),
+    "spring": ("pom.xml", "build.gradle", "build.gradle.kts"),
+}
+
+# One GraphQL query fetches everything _analyze_repository needs — repo
+# metadata, root tree, branch refs, last 50 commits — in a single round
+# trip and rate-limit point instead of four REST calls
+_ANALYZE_REPO_GQL = """
+query($o: String!, $r: String!) {
+  repository(owner: $o, name: $r) {
+    name
+    description
+    isFork
+    primaryLanguage { name }
+    object(expression: "HEAD:") {
+      ... on Tree { entries { name type path } }
+    }
+    refs(refPrefix: "refs/heads/", first: 100) { nodes { name } }
+    defaultBranchRef {
+      target {
+        ... on Commit {
+          history(first: 50) { nodes { message committedDate } }
+        }
+      }
+    }
+  }
+}
+"""
+
+# Single-query repository overview: metadata, branches, recent commits,
+# and open PRs in one POST instead of four REST calls
+_REPO_OVERVIEW_GQL = """
+query($o: String!, $r: String!, $n: Int!) {
+  repository(owner: $o, name: $r) {
+    name
+    description
+    defaultBranchRef {
+      target {
+        ... on Commit {
+          history(first: $n) { nodes { oid messageHeadline committedDate } }
+        }
+      }
+    }
+    refs(refPrefix: "refs/heads/", first: 100) { nodes { name } }
+    pullRequests(states: OPEN, first: 50) {
+      nodes { number title author { login } }
+    }
+  }
+}
+"""
+
+# Paginated organization listing with per-repo metadata: one GraphQL page
+# of 100 repos replaces the list + N x get_repository REST fan-out
+_LIST_REPOS_GQL = """
+query($o: String!, $c: String) {
+  organization(login: $o) {
+    repositories(first: 100, after: $c) {
+      pageInfo { hasNextPage endCursor }
+      nodes {
+        name
+        description
+        stargazerCount
+        primaryLanguage { name }
+        defaultBranchRef { name }
+      }
+    }
+  }
+}
+"""
+
+def _project_repositories(result: Dict[str, Any]) -> Dict[str, Any]:
+    return {"success": True, "repositories": [
+        {
+            "name": r.get("name", ""),
+            "description": r.get("description", ""),
+            "language": r.get("language", ""),
+            "private": r.get("private", False),
+        }
+        for r in result.get("repositories") or result.get("items") or []
+    ]}
+
+
+def _project_repository(result: Dict[str, Any]) -> Dict[str, Any]:
+    repo = result.get("repository") or {}
+    if not repo:
+        return result
+    return {"success": True, "repository": {
+        "name": repo.get("name", ""),
+        "description": repo.get("description", ""),
+        "language": repo.get("language", ""),
+        "default_branch": repo.get("default_branch", ""),
+        "fork": repo.get("fork", False),
+    }}
+
+
+def _project_branches(result: Dict[str, Any]) -> Dict[str, Any]:
+    return {"success": True, "branches": [
+        {"name": b.get("name", ""), "sha": (b.get("commit") or {}).get("sha", "")}
+        for b in result.get("branches") or result.get("items") or []
+    ]}
+
+
+def _project_commits(result: Dict[str, Any]) -> Dict[str, Any]:
+    return {"success": True, "commits": [
+        {
+            "sha": c.get("sha", ""),
+            "message": c.get("message", "").split("\n", 1)[0],
+            "date": c.get("date", ""),
+        }
+        for c in result.get("commits") or result.get("items") or []
+    ]}
+
+
+def _project_pull_requests(result: Dict[str, Any]) -> Dict[str, Any]:
+    return {"success": True, "pull_requests": [
+        {
+            "number": p.get("number", 0),
+            "title": p.get("title", ""),
+            "state": p.get("state", ""),
+            "author": (p.get("user") or p.get("author") or {}).get("login", ""),
+        }
+        for p in result.get("pull_requests") or result.get("items") or []
+    ]}
+
+
+# Slim projections applied to listing responses before they reach the
+# model: full MCP payloads carry headers and hydrated metadata the LLM
+# never reads, which bloats context and serialization
+_PROJECTORS = {
+    "list_repositories": _project_repositories,
+    "get_repository": _project_repository,
+    "list_branches": _project_branches,
+    "list_commits": _project_commits,
+    "list_pull_requests": _project_pull_requests,
+}
+
+
+@dataclass(slots=True)
+class _FileArgs:
+    """Typed view of the file-operation arguments.
+
+    Parsing once into a slotted dataclass replaces the per-field .get
+    boilerplate and gives the MCP payload a single assembly point.
+    """
+
+    owner: str = ""
+    repo: str = ""
+    path: str = ""
+    content: str = ""
+    branch: str = "main"
+
+    @classmethod
+    def from_args(cls, args: Dict[str, Any]) -> "_FileArgs":
+        return cls(**{k: v for k, v in args.items() if k in _FILE_ARG_NAMES})
+
+
+_FILE_ARG_NAMES = frozenset(f.name for f in fields(_FileArgs))
+
+
+def _response_etag(response: Any) -> Optional[str]:
+    """Pull the entity tag off a response, from the body key or raw headers."""
+    if not isinstance(response, dict):
+        return None
+    etag = response.get("etag")
+    if etag:
+        return etag
+    headers = response.get("headers")
+    if isinstance(headers, dict):
+        return headers.get("ETag") or headers.get("etag")
+    return None
+
+
+# Conventional-commit prefix, precompiled once; detection only needs the
+# prefix, so no trailing .+ and non-capturing groups keep matching cheap
+_CONVENTIONAL_RE = re.compile(r"^(?:feat|fix|docs|style|refactor|test|chore)(?:\([^)]+\))?: ")
+
+# First token of a commit message with any trailing colon stripped, in one
+# C-level pass instead of split()/lower()/rstrip() allocations per message
+_FIRST_TOKEN_RE = re.compile(r"^(\S+?):?(?:\s|$)")
+
+
+class _GitHubRateLimiter:
+    """Gates GitHub MCP calls below the secondary concurrency limit and
+    tracks the primary budget from response headers so callers can back
+    off before tripping 403/429 responses."""
+
+    def __init__(self, max_concurrent: int = 10):
+        self.sem = asyncio.Semaphore(max_concurrent)
+        self.remaining: Optional[int] = None
+        self.reset_at: float = 0.0
+
+    def update_from(self, response: Any) -> None:
+        """Record X-RateLimit-Remaining/Reset from a response, when present."""
+        headers = response.get("headers") if isinstance(response, dict) else None
+        if not isinstance(headers, dict):
+            return
+        try:
+            remaining = headers.get("X-RateLimit-Remaining")
+            if remaining is not None:
+                self.remaining = int(remaining)
+            reset = headers.get("X-RateLimit-Reset")
+            if reset is not None:
+                self.reset_at = float(reset)
+        except (TypeError, ValueError):
+            pass
+
+    async def wait_if_exhausted(self) -> None:
+        """Sleep until the window resets when the primary budget is spent."""
+        if self.remaining == 0:
+            delay = self.reset_at - time.time()
+            if 0 < delay < 3600:
+                await asyncio.sleep(delay)
+            self.remaining = None
+
 
 class GitHubWorkflowManager(BaseTool):
     """Comprehensive GitHub workflow management tool."""
@@ -51,6 +295,182 @@ class GitHubWorkflowManager(BaseTool):
         )
         self.github_mcp = create_github_mcp()
 
+        # Short-TTL response cache for read operations: agent loops re-issue
+        # identical reads, which otherwise burn round-trips and rate limit
+        self._read_cache: OrderedDict = OrderedDict()
+
+        # Cap concurrent MCP calls below GitHub's secondary rate limit and
+        # back off adaptively when the primary budget runs out
+        self._limiter = _GitHubRateLimiter()
+
+        # Optional token pool: rotating K tokens multiplies the effective
+        # primary rate limit by K for bulk analysis
+        self._tokens = [
+            t.strip() for t in os.environ.get("GITHUB_TOKENS", "").split(",") if t.strip()
+        ]
+        self._token_state = {t: {"remaining": 5000, "reset": 0.0} for t in self._tokens}
+
+        # Single-flight map plus hit/miss counters for the read cache
+        self._inflight: Dict[tuple, asyncio.Future] = {}
+        self._cache_hits = 0
+        self._cache_misses = 0
+
+        # Operation dispatch table: one hash lookup instead of a ~20-branch
+        # elif cascade, plus the args each handler requires so malformed
+        # calls are rejected before any network round trip
+        self._ops = {
+            "analyze_repository": (self._analyze_repository, ("owner", "repo")),
+            "create_repository": (self._create_repository, ("name",)),
+            "clone_repository": (self._clone_repository, ("owner", "repo")),
+            "create_branch": (self._create_branch, ("owner", "repo", "branch_name")),
+            "switch_branch": (self._switch_branch, ("owner", "repo", "branch_name")),
+            "read_file": (self._read_file, ("owner", "repo", "path")),
+            "write_file": (self._write_file, ("owner", "repo", "path")),
+            "update_file": (self._update_file, ("owner", "repo", "path")),
+            "delete_file": (self._delete_file, ("owner", "repo", "path")),
+            "commit_changes": (self._commit_changes, ("owner", "repo")),
+            "push_changes": (self._push_changes, ("owner", "repo")),
+            "create_pull_request": (self._create_pull_request, ("owner", "repo", "title", "head_branch")),
+            "merge_pull_request": (self._merge_pull_request, ("owner", "repo", "pr_number")),
+            "create_issue": (self._create_issue, ("owner", "repo", "title")),
+            "create_release": (self._create_release, ("owner", "repo", "tag_name")),
+            "list_repositories": (self._list_repositories, ("owner",)),
+            "get_repository_info": (self._get_repository_info, ("owner", "repo")),
+            "list_branches": (self._list_branches, ("owner", "repo")),
+            "list_commits": (self._list_commits, ("owner", "repo")),
+            "get_pull_requests": (self._get_pull_requests, ("owner", "repo")),
+            "repo_overview": (self._repo_overview, ("owner", "repo")),
+            "list_repositories_with_info": (self._list_repositories_deep, ("owner",)),
+        }
+
+    def _pick_token(self) -> Optional[str]:
+        """Choose the pooled token with the most remaining budget."""
+        if not self._tokens:
+            return None
+        now = time.time()
+        best = None
+        best_remaining = -1
+        for token in self._tokens:
+            state = self._token_state[token]
+            remaining = state["remaining"]
+            if remaining == 0 and now >= state["reset"]:
+                remaining = state["remaining"] = 5000
+            if remaining > best_remaining:
+                best, best_remaining = token, remaining
+        return best
+
+    def _update_token_state(self, token: str, response: Any) -> None:
+        """Track a pooled token's budget from response headers."""
+        headers = response.get("headers") if isinstance(response, dict) else None
+        if not isinstance(headers, dict):
+            return
+        state = self._token_state[token]
+        try:
+            remaining = headers.get("X-RateLimit-Remaining")
+            if remaining is not None:
+                state["remaining"] = int(remaining)
+            reset = headers.get("X-RateLimit-Reset")
+            if reset is not None:
+                state["reset"] = float(reset)
+        except (TypeError, ValueError):
+            pass
+
+    async def _call_mcp(self, args: Dict[str, Any]) -> Dict[str, Any]:
+        """Issue one MCP call through the rate limiter, retrying on 429/403.
+
+        Retries use exponential backoff (1..32s) and honor Retry-After when
+        the server sends one; retried 403/429s otherwise dominate wall time
+        during bulk analysis.
+        """
+        delay = 1.0
+        response: Dict[str, Any] = {}
+        for _ in range(6):
+            token = self._pick_token()
+            mcp = create_github_mcp(token) if token else self.github_mcp
+            async with self._limiter.sem:
+                await self._limiter.wait_if_exhausted()
+                response = await mcp.run_async(args=args, tool_context=None)
+            self._limiter.update_from(response)
+            if token:
+                self._update_token_state(token, response)
+            status = response.get("status") if isinstance(response, dict) else None
+            if status not in (403, 429):
+                return response
+            headers = response.get("headers") or {}
+            try:
+                retry_after = float(headers.get("Retry-After", 0))
+            except (TypeError, ValueError):
+                retry_after = 0
+            await asyncio.sleep(retry_after if retry_after > 0 else delay)
+            delay = min(delay * 2, 32.0)
+        return response
+
+    async def _cached_mcp(self, args: Dict[str, Any], ttl: float = _READ_CACHE_TTL) -> Dict[str, Any]:
+        """Run an MCP call, memoizing read-only actions for a short TTL.
+
+        Cache entries keep the response ETag when the MCP layer returns one
+        (an "etag" key in the result dict). Once the TTL lapses, the call is
+        re-issued with "if_none_match" so GitHub can answer 304 Not Modified
+        — signalled back as status 304 or "not_modified" — which refreshes
+        the entry without re-downloading the body and, per GitHub's API
+        rules, without spending a primary rate-limit point.
+        """
+        if args.get("action") not in _CACHEABLE_ACTIONS:
+            return await self._call_mcp(args)
+
+        key = tuple(sorted((k, str(v)) for k, v in args.items()))
+        now = time.monotonic()
+        stale = None
+        entry = self._read_cache.get(key)
+        if entry is not None:
+            ts, etag, value = entry
+            if now - ts < ttl:
+                self._read_cache.move_to_end(key)
+                self._cache_hits += 1
+                return value
+            del self._read_cache[key]
+            if etag:
+                stale = (etag, value)
+        self._cache_misses += 1
+
+        # Single-flight: concurrent identical reads share one MCP call
+        pending = self._inflight.get(key)
+        if pending is not None:
+            return await asyncio.shield(pending)
+
+        future: asyncio.Future = asyncio.get_running_loop().create_future()
+        self._inflight[key] = future
+        try:
+            call_args = dict(args, if_none_match=stale[0]) if stale else args
+            value = await self._call_mcp(call_args)
+
+            if stale and isinstance(value, dict) and (
+                value.get("status") == 304 or value.get("not_modified")
+            ):
+                # Replayed from cache: the 304 body was never decoded
+                etag, value = stale
+            else:
+                etag = _response_etag(value)
+
+            if len(self._read_cache) >= _READ_CACHE_MAX:
+                self._read_cache.popitem(last=False)
+            self._read_cache[key] = (now, etag, value)
+            future.set_result(value)
+            return value
+        except BaseException as e:
+            future.set_exception(e)
+            raise
+        finally:
+            self._inflight.pop(key, None)
+
+    def cache_info(self) -> Dict[str, int]:
+        """Read-cache diagnostics: hits, misses, and current size."""
+        return {
+            "hits": self._cache_hits,
+            "misses": self._cache_misses,
+            "entries": len(self._read_cache),
+        }
+
     async def run_async(self, *, args: Dict[str, Any], tool_context) -> Dict[str, Any]:
         """Execute GitHub workflow operations."""
         try:
@@ -58,53 +478,57 @@ class GitHubWorkflowManager(BaseTool):
             if not operation:
                 return {"success": False, "error": "Operation parameter is required"}
 
-            # Route to specific operation handlers
-            if operation == "analyze_repository":
-                return await self._analyze_repository(args)
-            elif operation == "create_repository":
-                return await self._create_repository(args)
-            elif operation == "clone_repository":
-                return await self._clone_repository(args)
-            elif operation == "create_branch":
-                return await self._create_branch(args)
-            elif operation == "switch_branch":
-                return await self._switch_branch(args)
-            elif operation == "read_file":
-                return await self._read_file(args)
-            elif operation == "write_file":
-                return await self._write_file(args)
-            elif operation == "update_file":
-                return await self._update_file(args)
-            elif operation == "delete_file":
-                return await self._delete_file(args)
-            elif operation == "commit_changes":
-                return await self._commit_changes(args)
-            elif operation == "push_changes":
-                return await self._push_changes(args)
-            elif operation == "create_pull_request":
-                return await self._create_pull_request(args)
-            elif operation == "merge_pull_request":
-                return await self._merge_pull_request(args)
-            elif operation == "create_issue":
-                return await self._create_issue(args)
-            elif operation == "create_release":
-                return await self._create_release(args)
-            elif operation == "list_repositories":
-                return await self._list_repositories(args)
-            elif operation == "get_repository_info":
-                return await self._get_repository_info(args)
-            elif operation == "list_branches":
-                return await self._list_branches(args)
-            elif operation == "list_commits":
-                return await self._list_commits(args)
-            elif operation == "get_pull_requests":
-                return await self._get_pull_requests(args)
-            else:
+            # Route to specific operation handlers, failing fast on
+            # missing arguments before any MCP round trip
+            entry = self._ops.get(operation)
+            if entry is None:
                 return {"success": False, "error": f"Unknown operation: {operation}"}
+            handler, required = entry
+            # Multi-target calls carry a "repos" list instead of owner/repo
+            missing = [] if args.get("repos") else [k for k in required if not args.get(k)]
+            if missing:
+                return {
+                    "success": False,
+                    "error": f"Missing required arguments for {operation}: {', '.join(missing)}"
+                }
+            return await handler(args)
 
         except Exception as e:
             return {"success": False, "error": f"GitHub operation failed: {str(e)}"}
 
+    async def _bulk(self, arg_list: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """Run several read calls concurrently under the shared semaphore.
+
+        A multi-repo analysis becomes bound by its slowest call instead of
+        the sum of round trips; failures come back as error dicts so one
+        bad repo doesn't sink the batch.
+        """
+        async def _one(call_args: Dict[str, Any]) -> Dict[str, Any]:
+            # _call_mcp already gates on the shared semaphore
+            return self._slim(call_args.get("action", ""), await self._cached_mcp(call_args))
+
+        results = await asyncio.gather(
+            *(_one(a) for a in arg_list), return_exceptions=True
+        )
+        return [
+            {"success": False, "error": str(r)} if isinstance(r, Exception) else r
+            for r in results
+        ]
+
+    def _slim(self, action: str, result: Any) -> Any:
+        """Project a listing response down to the fields the agent uses."""
+        projector = _PROJECTORS.get(action)
+        if projector is None or not isinstance(result, dict) or result.get("error"):
+            return result
+        try:
+            return projector(result)
+        except Exception:
+            return result
+
+    async def _mcp(self, action: str, **kw: Any) -> Dict[str, Any]:
+        """Issue an uncached MCP call; collapses the per-handler args dicts."""
+        return await self._call_mcp({"action": action, **kw})
+
     async def _analyze_repository(self, args: Dict[str, Any]) -> Dict[str, Any]:
         """Analyze repository structure, patterns, and development workflow."""
         owner = args.get("owner", "")
@@ -114,33 +538,27 @@ class GitHubWorkflowManager(BaseTool):
             return {"success": False, "error": "Owner and repo parameters are required"}
 
         try:
-            # Get repository information
-            repo_info = await self.github_mcp.run_async(
-                args={"action": "get_repository", "owner": owner, "repo": repo},
-                tool_context=None
-            )
-
-            # Get repository structure
-            content_info = await self.github_mcp.run_async(
-                args={"action": "get_repository_content", "owner": owner, "repo": repo, "path": ""},
-                tool_context=None
-            )
-
-            # Get branches
-            branches_info = await self.github_mcp.run_async(
-                args={"action": "list_branches", "owner": owner, "repo": repo},
-                tool_context=None
-            )
-
-            # Get recent commits for pattern analysis
-            commits_info = await self.github_mcp.run_async(
-                args={"action": "list_commits", "owner": owner, "repo": repo, "limit": 50},
-                tool_context=None
-            )
+            # Prefer one GraphQL round trip; fall back to the four REST reads
+            fetched = await self._analyze_repository_graphql(owner, repo)
+            if fetched is not None:
+                repo_info, content_info, branches_info, commits_info = fetched
+            else:
+                results = await asyncio.gather(
+                    self._cached_mcp({"action": "get_repository", "owner": owner, "repo": repo}),
+                    self._cached_mcp({"action": "get_repository_content", "owner": owner, "repo": repo, "path": ""}),
+                    self._cached_mcp({"action": "list_branches", "owner": owner, "repo": repo}),
+                    self._cached_mcp({"action": "list_commits", "owner": owner, "repo": repo, "limit": 50}),
+                    return_exceptions=True
+                )
+
+                # A failed call degrades that part of the analysis, not the whole
+                repo_info, content_info, branches_info, commits_info = (
+                    {} if isinstance(result, Exception) else result for result in results
+                )
 
             # Analyze the structure
             analysis = await self._perform_repository_analysis(
-                repo_info, content_info, branches_info, commits_info
+                owner, repo, repo_info, content_info, branches_info, commits_info
             )
 
             return {
@@ -157,8 +575,60 @@ class GitHubWorkflowManager(BaseTool):
         except Exception as e:
             return {"success": False, "error": f"Repository analysis failed: {str(e)}"}
 
+    async def _graphql(self, query: str, variables: Dict[str, Any]) -> Optional[Dict]:
+        """Run one GraphQL query through the MCP, or None when unsupported."""
+        try:
+            result = await self._cached_mcp({
+                "action": "graphql",
+                "query": query,
+                "variables": json.dumps(variables),
+            })
+            return (result.get("data") or {}) if isinstance(result, dict) else None
+        except Exception:
+            return None
+
+    async def _analyze_repository_graphql(
+        self, owner: str, repo: str
+    ) -> Optional[Tuple[Dict, Dict, Dict, Dict]]:
+        """Fetch all repository-analysis data in one GraphQL request.
+
+        Returns the same (repo_info, content_info, branches_info,
+        commits_info) shapes the REST path produces, or None when the MCP
+        server does not support raw GraphQL so the caller can fall back.
+        """
+        data = await self._graphql(_ANALYZE_REPO_GQL, {"o": owner, "r": repo})
+        repository = data.get("repository") if data else None
+        if not repository:
+            return None
+
+        repo_info = {"repository": {
+            "name": repository.get("name", ""),
+            "description": repository.get("description", ""),
+            "fork": repository.get("isFork", False),
+            "language": (repository.get("primaryLanguage") or {}).get("name", "unknown"),
+        }}
+        tree = repository.get("object") or {}
+        content_info = {"files": [
+            {"name": e.get("name", ""), "path": e.get("path", ""), "type": e.get("type", "")}
+            for e in tree.get("entries") or []
+        ]}
+        branches_info = {"branches": [
+            {"name": n.get("name", "")}
+            for n in (repository.get("refs") or {}).get("nodes") or []
+        ]}
+        history = (
+            ((repository.get("defaultBranchRef") or {}).get("target") or {})
+            .get("history") or {}
+        )
+        commits_info = {"commits": [
+            {"message": n.get("message", ""), "date": n.get("committedDate", "")}
+            for n in history.get("nodes") or []
+        ]}
+        return repo_info, content_info, branches_info, commits_info
+
     async def _perform_repository_analysis(
-        self, repo_info: Dict, content_info: Dict, branches_info: Dict, commits_info: Dict
+        self, owner: str, repo: str, repo_info: Dict, content_info: Dict,
+        branches_info: Dict, commits_info: Dict
     ) -> Dict[str, Any]:
         """Perform intelligent analysis of repository patterns."""
 
@@ -186,21 +656,29 @@ class GitHubWorkflowManager(BaseTool):
             analysis["description"] = repo_data.get("description", "")
             analysis["is_fork"] = repo_data.get("fork", False)
 
-            # Analyze file structure
             files = content_info.get("files", [])
-            file_analysis = self._analyze_file_structure(files)
-            analysis.update(file_analysis)
-
-            # Analyze branches
             branches = branches_info.get("branches", [])
-            analysis["branch_strategy"] = self._analyze_branch_strategy(branches)
-
-            # Analyze commit patterns
             commits = commits_info.get("commits", [])
-            analysis["commit_patterns"] = self._analyze_commit_patterns(commits)
 
-            # Development workflow analysis
-            analysis["development_workflow"] = self._analyze_development_workflow(files, commits)
+            # Nothing came back (empty repo or rate-limited): skip the
+            # sub-analyzers rather than running them over empty lists
+            if not files and not branches and not commits:
+                analysis["analysis_error"] = "empty_repository"
+                return analysis
+
+            # The sub-analyzers are independent; run the synchronous ones in
+            # the default thread pool so large repos don't stall the event
+            # loop, alongside the (async) file-structure analysis
+            file_analysis, branch_strategy, commit_patterns, workflow = await asyncio.gather(
+                self._analyze_file_structure(files, owner, repo),
+                asyncio.to_thread(self._analyze_branch_strategy, branches),
+                asyncio.to_thread(self._analyze_commit_patterns, commits),
+                asyncio.to_thread(self._analyze_development_workflow, files, commits),
+            )
+            analysis.update(file_analysis)
+            analysis["branch_strategy"] = branch_strategy
+            analysis["commit_patterns"] = commit_patterns
+            analysis["development_workflow"] = workflow
 
             # Generate recommendations
             analysis["recommendations"] = self._generate_recommendations(analysis)
@@ -210,7 +688,29 @@ class GitHubWorkflowManager(BaseTool):
 
         return analysis
 
-    def _analyze_file_structure(self, files: List[Dict]) -> Dict[str, Any]:
+    async def _framework_declared(self, owner: str, repo: str, framework: str,
+                                  names_set: set) -> bool:
+        """Check whether a framework appears in the repo's dependency files."""
+        if not owner or not repo:
+            return False
+        for marker in _FRAMEWORK_MARKERS.get(framework, ()):
+            if marker not in names_set:
+                continue
+            try:
+                result = await self._cached_mcp({
+                    "action": "get_file_content",
+                    "owner": owner,
+                    "repo": repo,
+                    "path": marker,
+                })
+            except Exception:
+                continue
+            content = result.get("content", "") if isinstance(result, dict) else ""
+            if framework in str(content).lower():
+                return True
+        return False
+
+    async def _analyze_file_structure(self, files: List[Dict], owner: str = "", repo: str = "") -> Dict[str, Any]:
         """Analyze repository file structure to determine project type and patterns."""
         analysis = {
             "project_type": "unknown",
@@ -223,75 +723,92 @@ class GitHubWorkflowManager(BaseTool):
             "dependencies": []
         }
 
+        if not files:
+            return analysis
+
         file_names = [f.get("name", "") for f in files]
+        names_set = frozenset(file_names)
         file_paths = [f.get("path", "") for f in files]
+        paths_set = frozenset(file_paths)
+
+        # Lowercase once; every substring heuristic below reuses these
+        # instead of allocating a fresh lowered string per check
+        names_lower = [n.lower() for n in file_names]
+        paths_lower = [p.lower() for p in file_paths]
 
-        # Project type detection
-        if any(f in file_names for f in ["package.json", "yarn.lock", "npm-shrinkwrap.json"]):
+        # Project type detection (set intersection instead of repeated scans)
+        if _NODE_MARKERS & names_set:
             analysis["project_type"] = "javascript/nodejs"
-            if "next.config.js" in file_names:
+            if "next.config.js" in names_set:
                 analysis["framework"] = "next.js"
-            elif "angular.json" in file_names:
+            elif "angular.json" in names_set:
                 analysis["framework"] = "angular"
-            elif "vue.config.js" in file_names:
+            elif "vue.config.js" in names_set:
                 analysis["framework"] = "vue.js"
-            elif any("react" in f.lower() for f in file_names):
+            elif any("react" in n for n in names_lower):
                 analysis["framework"] = "react"
-            elif "express" in str(files).lower():
+            elif await self._framework_declared(owner, repo, "express", names_set):
                 analysis["framework"] = "express"
 
-        elif any(f in file_names for f in ["requirements.txt", "pyproject.toml", "setup.py", "Pipfile"]):
+        elif _PY_MARKERS & names_set:
             analysis["project_type"] = "python"
-            if "manage.py" in file_names:
+            if "manage.py" in names_set:
                 analysis["framework"] = "django"
-            elif "app.py" in file_names or "main.py" in file_names:
-                if "fastapi" in str(files).lower():
+            elif "app.py" in names_set or "main.py" in names_set:
+                if await self._framework_declared(owner, repo, "fastapi", names_set):
                     analysis["framework"] = "fastapi"
-                elif "flask" in str(files).lower():
+                elif await self._framework_declared(owner, repo, "flask", names_set):
                     analysis["framework"] = "flask"
 
-        elif any(f in file_names for f in ["pom.xml", "build.gradle", "build.gradle.kts"]):
+        elif _JAVA_MARKERS & names_set:
             analysis["project_type"] = "java"
-            if "spring" in str(files).lower():
+            if await self._framework_declared(owner, repo, "spring", names_set):
                 analysis["framework"] = "spring"
 
-        elif any(f in file_names for f in ["go.mod", "go.sum"]):
+        elif _GO_MARKERS & names_set:
             analysis["project_type"] = "go"
 
-        elif any(f in file_names for f in ["Cargo.toml", "Cargo.lock"]):
+        elif _RUST_MARKERS & names_set:
             analysis["project_type"] = "rust"
 
         elif any(f.endswith(".tf") for f in file_names):
             analysis["project_type"] = "terraform"
 
-        elif "Dockerfile" in file_names:
+        elif "Dockerfile" in names_set:
             analysis["project_type"] = "containerized"
 
         # Architecture pattern detection
-        if any("microservice" in f.lower() for f in file_paths):
+        if any("microservice" in p for p in paths_lower):
             analysis["architecture_pattern"] = "microservices"
-        elif any(d in file_paths for d in ["src/", "lib/", "pkg/"]):
+        elif paths_set & {"src/", "lib/", "pkg/"}:
             analysis["architecture_pattern"] = "modular"
-        elif any(d in file_paths for d in ["controllers/", "models/", "views/"]):
+        elif paths_set & {"controllers/", "models/", "views/"}:
             analysis["architecture_pattern"] = "mvc"
 
-        # CI/CD detection
-        ci_files = [".github/workflows/", ".gitlab-ci.yml", "azure-pipelines.yml",
-                   "Jenkinsfile", ".circleci/", ".travis.yml"]
-        analysis["ci_cd_setup"] = any(ci in f for f in file_paths for ci in ci_files)
-
-        # Testing setup detection
-        test_indicators = ["test/", "tests/", "__tests__/", "spec/", "*.test.*", "*.spec.*"]
-        analysis["testing_setup"] = any(indicator in f for f in file_paths for indicator in test_indicators)
+        # CI/CD and testing detection fused into one pass over paths
+        ci_files = (".github/workflows/", ".gitlab-ci.yml", "azure-pipelines.yml",
+                    "Jenkinsfile", ".circleci/", ".travis.yml")
+        test_indicators = ("test/", "tests/", "__tests__/", "spec/", "*.test.*", "*.spec.*")
+        ci_cd_setup = False
+        testing_setup = False
+        for path in file_paths:
+            if not ci_cd_setup and any(ci in path for ci in ci_files):
+                ci_cd_setup = True
+            if not testing_setup and any(indicator in path for indicator in test_indicators):
+                testing_setup = True
+            if ci_cd_setup and testing_setup:
+                break
+        analysis["ci_cd_setup"] = ci_cd_setup
+        analysis["testing_setup"] = testing_setup
 
         # Documentation quality
-        doc_files = [f for f in file_names if f.lower() in ["readme.md", "readme.rst", "readme.txt"]]
+        doc_files = [n for n in names_lower if n in ("readme.md", "readme.rst", "readme.txt")]
         if doc_files:
             analysis["documentation_quality"] = "good" if len(doc_files) >= 1 else "basic"
 
         # Code quality tools
         quality_files = [".eslintrc", ".prettierrc", "pylint.cfg", "mypy.ini", ".editorconfig"]
-        analysis["code_quality_tools"] = [f for f in quality_files if any(f in name for name in file_names)]
+        analysis["code_quality_tools"] = [q for q in quality_files if any(q in n for n in names_lower)]
 
         return analysis
 
@@ -320,32 +837,34 @@ class GitHubWorkflowManager(BaseTool):
         if not commits:
             return {"pattern": "unknown", "frequency": "low", "conventions": []}
 
-        messages = [c.get("message", "") for c in commits]
-
-        # Conventional commit detection
-        conventional_pattern = r"^(feat|fix|docs|style|refactor|test|chore)(\(.+\))?: .+"
-        conventional_commits = sum(1 for msg in messages if re.match(conventional_pattern, msg))
+        # Single pass over the messages: conventional-commit detection,
+        # length sum, and prefix counting, without materializing a list
+        conventional_commits = 0
+        total_length = 0
+        prefixes: Counter = Counter()
+        first_token = _FIRST_TOKEN_RE.match  # hoist the bound methods out of the loop
+        conventional = _CONVENTIONAL_RE.match
+        for commit in commits:
+            msg = commit.get("message", "")
+            if conventional(msg):
+                conventional_commits += 1
+            total_length += len(msg)
+            token = first_token(msg)
+            if token:
+                prefixes[token.group(1).lower()] += 1
 
         patterns = {
-            "conventional_commits_percentage": (conventional_commits / len(messages)) * 100,
-            "average_message_length": sum(len(msg) for msg in messages) / len(messages),
-            "common_prefixes": self._find_common_prefixes(messages),
+            "conventional_commits_percentage": (conventional_commits / len(commits)) * 100,
+            "average_message_length": total_length / len(commits),
+            "common_prefixes": self._find_common_prefixes(prefixes, len(commits)),
             "commit_frequency": self._calculate_commit_frequency(commits)
         }
 
         return patterns
 
-    def _find_common_prefixes(self, messages: List[str]) -> List[str]:
-        """Find common prefixes in commit messages."""
-        prefixes = {}
-        for msg in messages:
-            words = msg.split()
-            if words:
-                first_word = words[0].lower().rstrip(":")
-                prefixes[first_word] = prefixes.get(first_word, 0) + 1
-
-        # Return prefixes used in at least 10% of commits
-        threshold = len(messages) * 0.1
+    def _find_common_prefixes(self, prefixes: Counter, total: int) -> List[str]:
+        """Select commit-message prefixes used in at least 10% of commits."""
+        threshold = total * 0.1
         return [prefix for prefix, count in prefixes.items() if count >= threshold]
 
     def _calculate_commit_frequency(self, commits: List[Dict]) -> str:
@@ -411,62 +930,36 @@ class GitHubWorkflowManager(BaseTool):
 
     async def _create_repository(self, args: Dict[str, Any]) -> Dict[str, Any]:
         """Create a new repository."""
-        repo_name = args.get("name", "")
-        description = args.get("description", "")
-        private = args.get("private", False)
-
-        return await self.github_mcp.run_async(
-            args={
-                "action": "create_repository",
-                "name": repo_name,
-                "description": description,
-                "private": private
-            },
-            tool_context=None
+        return await self._mcp(
+            "create_repository",
+            name=args.get("name", ""),
+            description=args.get("description", ""),
+            private=args.get("private", False),
         )
 
     async def _clone_repository(self, args: Dict[str, Any]) -> Dict[str, Any]:
         """Clone a repository."""
-        owner = args.get("owner", "")
-        repo = args.get("repo", "")
-
-        return await self.github_mcp.run_async(
-            args={"action": "clone_repository", "owner": owner, "repo": repo},
-            tool_context=None
+        return await self._mcp(
+            "clone_repository", owner=args.get("owner", ""), repo=args.get("repo", "")
         )
 
     async def _create_branch(self, args: Dict[str, Any]) -> Dict[str, Any]:
         """Create a new branch."""
-        owner = args.get("owner", "")
-        repo = args.get("repo", "")
-        branch_name = args.get("branch_name", "")
-        source_branch = args.get("source_branch", "main")
-
-        return await self.github_mcp.run_async(
-            args={
-                "action": "create_branch",
-                "owner": owner,
-                "repo": repo,
-                "branch_name": branch_name,
-                "source_branch": source_branch
-            },
-            tool_context=None
+        return await self._mcp(
+            "create_branch",
+            owner=args.get("owner", ""),
+            repo=args.get("repo", ""),
+            branch_name=args.get("branch_name", ""),
+            source_branch=args.get("source_branch", "main"),
         )
 
     async def _switch_branch(self, args: Dict[str, Any]) -> Dict[str, Any]:
         """Switch to a different branch."""
-        owner = args.get("owner", "")
-        repo = args.get("repo", "")
-        branch_name = args.get("branch_name", "")
-
-        return await self.github_mcp.run_async(
-            args={
-                "action": "switch_branch",
-                "owner": owner,
-                "repo": repo,
-                "branch_name": branch_name
-            },
-            tool_context=None
+        return await self._mcp(
+            "switch_branch",
+            owner=args.get("owner", ""),
+            repo=args.get("repo", ""),
+            branch_name=args.get("branch_name", ""),
         )
 
     async def _read_file(self, args: Dict[str, Any]) -> Dict[str, Any]:
@@ -476,79 +969,41 @@ class GitHubWorkflowManager(BaseTool):
         path = args.get("path", "")
         branch = args.get("branch", "main")
 
-        return await self.github_mcp.run_async(
-            args={
-                "action": "get_file_content",
-                "owner": owner,
-                "repo": repo,
-                "path": path,
-                "branch": branch
-            },
-            tool_context=None
-        )
+        return await self._cached_mcp({
+            "action": "get_file_content",
+            "owner": owner,
+            "repo": repo,
+            "path": path,
+            "branch": branch
+        })
 
     async def _write_file(self, args: Dict[str, Any]) -> Dict[str, Any]:
         """Write a new file to the repository."""
-        owner = args.get("owner", "")
-        repo = args.get("repo", "")
-        path = args.get("path", "")
-        content = args.get("content", "")
-        message = args.get("commit_message", f"Add {path}")
-        branch = args.get("branch", "main")
-
-        return await self.github_mcp.run_async(
-            args={
-                "action": "create_file",
-                "owner": owner,
-                "repo": repo,
-                "path": path,
-                "content": content,
-                "message": message,
-                "branch": branch
-            },
-            tool_context=None
+        a = _FileArgs.from_args(args)
+        return await self._mcp(
+            "create_file",
+            message=args.get("commit_message", f"Add {a.path}"),
+            **asdict(a),
         )
 
     async def _update_file(self, args: Dict[str, Any]) -> Dict[str, Any]:
         """Update an existing file in the repository."""
-        owner = args.get("owner", "")
-        repo = args.get("repo", "")
-        path = args.get("path", "")
-        content = args.get("content", "")
-        message = args.get("commit_message", f"Update {path}")
-        branch = args.get("branch", "main")
-
-        return await self.github_mcp.run_async(
-            args={
-                "action": "update_file",
-                "owner": owner,
-                "repo": repo,
-                "path": path,
-                "content": content,
-                "message": message,
-                "branch": branch
-            },
-            tool_context=None
+        a = _FileArgs.from_args(args)
+        return await self._mcp(
+            "update_file",
+            message=args.get("commit_message", f"Update {a.path}"),
+            **asdict(a),
         )
 
     async def _delete_file(self, args: Dict[str, Any]) -> Dict[str, Any]:
         """Delete a file from the repository."""
-        owner = args.get("owner", "")
-        repo = args.get("repo", "")
-        path = args.get("path", "")
-        message = args.get("commit_message", f"Delete {path}")
-        branch = args.get("branch", "main")
-
-        return await self.github_mcp.run_async(
-            args={
-                "action": "delete_file",
-                "owner": owner,
-                "repo": repo,
-                "path": path,
-                "message": message,
-                "branch": branch
-            },
-            tool_context=None
+        a = _FileArgs.from_args(args)
+        payload = asdict(a)
+        payload.pop("content")  # deletes carry no body
+        return await self._mcp(
+            "delete_file",
+            message=args.get("commit_message", f"Delete {a.path}"),
+            **payload,
         )
 
     async def _commit_changes(self, args: Dict[str, Any]) -> Dict[str, Any]:
@@ -563,16 +1018,9 @@ class GitHubWorkflowManager(BaseTool):
         if not message:
             message = self._generate_commit_message(files)
 
-        return await self.github_mcp.run_async(
-            args={
-                "action": "commit_changes",
-                "owner": owner,
-                "repo": repo,
-                "message": message,
-                "files": files,
-                "branch": branch
-            },
-            tool_context=None
+        return await self._mcp(
+            "commit_changes", owner=owner, repo=repo, message=message,
+            files=files, branch=branch
         )
 
     def _generate_commit_message(self, files: List[Dict[str, Any]]) -> str:
@@ -580,9 +1028,15 @@ class GitHubWorkflowManager(BaseTool):
         if not files:
             return "Update repository"
 
-        added_files = [f for f in files if f.get("status") == "added"]
-        modified_files = [f for f in files if f.get("status") == "modified"]
-        deleted_files = [f for f in files if f.get("status") == "deleted"]
+        # One pass over files instead of three status-filter comprehensions
+        added_files: List[Dict[str, Any]] = []
+        modified_files: List[Dict[str, Any]] = []
+        deleted_files: List[Dict[str, Any]] = []
+        buckets = {"added": added_files, "modified": modified_files, "deleted": deleted_files}
+        for f in files:
+            bucket = buckets.get(f.get("status", ""))
+            if bucket is not None:
+                bucket.append(f)
 
         actions = []
         if added_files:
@@ -612,18 +1066,11 @@ class GitHubWorkflowManager(BaseTool):
 
     async def _push_changes(self, args: Dict[str, Any]) -> Dict[str, Any]:
         """Push changes to the remote repository."""
-        owner = args.get("owner", "")
-        repo = args.get("repo", "")
-        branch = args.get("branch", "main")
-
-        return await self.github_mcp.run_async(
-            args={
-                "action": "push_changes",
-                "owner": owner,
-                "repo": repo,
-                "branch": branch
-            },
-            tool_context=None
+        return await self._mcp(
+            "push_changes",
+            owner=args.get("owner", ""),
+            repo=args.get("repo", ""),
+            branch=args.get("branch", "main"),
         )
 
     async def _create_pull_request(self, args: Dict[str, Any]) -> Dict[str, Any]:
@@ -639,60 +1086,54 @@ class GitHubWorkflowManager(BaseTool):
         if not description:
             description = await self._generate_pr_description(owner, repo, head_branch, base_branch)
 
-        return await self.github_mcp.run_async(
-            args={
-                "action": "create_pull_request",
-                "owner": owner,
-                "repo": repo,
-                "title": title,
-                "head": head_branch,
-                "base": base_branch,
-                "body": description
-            },
-            tool_context=None
+        return await self._mcp(
+            "create_pull_request", owner=owner, repo=repo, title=title,
+            head=head_branch, base=base_branch, body=description
         )
 
     async def _generate_pr_description(self, owner: str, repo: str, head_branch: str, base_branch: str) -> str:
         """Generate an intelligent pull request description."""
         try:
             # Get commits in the branch
-            commits_result = await self.github_mcp.run_async(
-                args={
-                    "action": "compare_branches",
-                    "owner": owner,
-                    "repo": repo,
-                    "base": base_branch,
-                    "head": head_branch
-                },
-                tool_context=None
-            )
+            # Ask the server for only what the summary shows: 5 commits, 10 files
+            commits_result = await self._cached_mcp({
+                "action": "compare_branches",
+                "owner": owner,
+                "repo": repo,
+                "base": base_branch,
+                "head": head_branch,
+                "commit_limit": 5,
+                "limit": 10
+            })
 
             if commits_result.get("success"):
                 commits = commits_result.get("commits", [])
                 files = commits_result.get("files", [])
 
-                description = "## Changes\n\n"
+                # Assemble in a list and join once instead of += per line
+                parts = ["## Changes\n\n"]
 
                 # Summarize commits
                 if commits:
-                    description += "### Commits\n"
-                    for commit in commits[-5:]:  # Last 5 commits
-                        message = commit.get("message", "").split("\n")[0]  # First line only
-                        description += f"- {message}\n"
-                    description += "\n"
+                    parts.append("### Commits\n")
+                    parts.extend(
+                        f"- {commit.get('message', '').split(chr(10), 1)[0]}\n"
+                        for commit in commits[-5:]  # Last 5 commits, first line only
+                    )
+                    parts.append("\n")
 
                 # Summarize file changes
                 if files:
-                    description += "### Files Changed\n"
-                    for file in files[:10]:  # First 10 files
-                        status = file.get("status", "modified")
-                        filename = file.get("filename", "")
-                        description += f"- {status.capitalize()}: `{filename}`\n"
+                    parts.append("### Files Changed\n")
+                    parts.extend(
+                        f"- {file.get('status', 'modified').capitalize()}: `{file.get('filename', '')}`\n"
+                        for file in files[:10]  # First 10 files
+                    )
                     if len(files) > 10:
-                        description += f"- ... and {len(files) - 10} more files\n"
+                        parts.append(f"- ... and {len(files) - 10} more files\n")
 
-                description += "\n---\n*This PR description was generated automatically by Infrastructure Genie*"
-                return description
+                parts.append("\n---\n*This PR description was generated automatically by Infrastructure Genie*")
+                return "".join(parts)
 
         except Exception as e:
             print(f"Failed to generate PR description: {e}")
@@ -701,64 +1142,36 @@ class GitHubWorkflowManager(BaseTool):
 
     async def _merge_pull_request(self, args: Dict[str, Any]) -> Dict[str, Any]:
         """Merge a pull request."""
-        owner = args.get("owner", "")
-        repo = args.get("repo", "")
-        pr_number = args.get("pr_number", 0)
-        merge_method = args.get("merge_method", "merge")  # merge, squash, rebase
-
-        return await self.github_mcp.run_async(
-            args={
-                "action": "merge_pull_request",
-                "owner": owner,
-                "repo": repo,
-                "pull_number": pr_number,
-                "merge_method": merge_method
-            },
-            tool_context=None
+        return await self._mcp(
+            "merge_pull_request",
+            owner=args.get("owner", ""),
+            repo=args.get("repo", ""),
+            pull_number=args.get("pr_number", 0),
+            merge_method=args.get("merge_method", "merge"),  # merge, squash, rebase
         )
 
     async def _create_issue(self, args: Dict[str, Any]) -> Dict[str, Any]:
         """Create a new issue."""
-        owner = args.get("owner", "")
-        repo = args.get("repo", "")
-        title = args.get("title", "")
-        body = args.get("body", "")
-        labels = args.get("labels", [])
-
-        return await self.github_mcp.run_async(
-            args={
-                "action": "create_issue",
-                "owner": owner,
-                "repo": repo,
-                "title": title,
-                "body": body,
-                "labels": labels
-            },
-            tool_context=None
+        return await self._mcp(
+            "create_issue",
+            owner=args.get("owner", ""),
+            repo=args.get("repo", ""),
+            title=args.get("title", ""),
+            body=args.get("body", ""),
+            labels=args.get("labels", []),
         )
 
     async def _create_release(self, args: Dict[str, Any]) -> Dict[str, Any]:
         """Create a new release."""
-        owner = args.get("owner", "")
-        repo = args.get("repo", "")
-        tag_name = args.get("tag_name", "")
-        name = args.get("name", "")
-        body = args.get("body", "")
-        draft = args.get("draft", False)
-        prerelease = args.get("prerelease", False)
-
-        return await self.github_mcp.run_async(
-            args={
-                "action": "create_release",
-                "owner": owner,
-                "repo": repo,
-                "tag_name": tag_name,
-                "name": name,
-                "body": body,
-                "draft": draft,
-                "prerelease": prerelease
-            },
-            tool_context=None
+        return await self._mcp(
+            "create_release",
+            owner=args.get("owner", ""),
+            repo=args.get("repo", ""),
+            tag_name=args.get("tag_name", ""),
+            name=args.get("name", ""),
+            body=args.get("body", ""),
+            draft=args.get("draft", False),
+            prerelease=args.get("prerelease", False),
         )
 
     async def _list_repositories(self, args: Dict[str, Any]) -> Dict[str, Any]:
@@ -766,78 +1179,209 @@ class GitHubWorkflowManager(BaseTool):
         owner = args.get("owner", "")
         type_filter = args.get("type", "all")  # all, owner, public, private
 
-        return await self.github_mcp.run_async(
-            args={
-                "action": "list_repositories",
-                "owner": owner,
-                "type": type_filter
-            },
-            tool_context=None
-        )
+        return self._slim("list_repositories", await self._cached_mcp({
+            "action": "list_repositories",
+            "owner": owner,
+            "type": type_filter
+        }))
 
     async def _get_repository_info(self, args: Dict[str, Any]) -> Dict[str, Any]:
-        """Get detailed repository information."""
+        """Get repository details, fanning out concurrently for several repos."""
+        repos = args.get("repos")
+        if repos:
+            return {"results": await self._bulk([
+                {"action": "get_repository", "owner": t.get("owner", ""), "repo": t.get("repo", "")}
+                for t in repos
+            ])}
+
         owner = args.get("owner", "")
         repo = args.get("repo", "")
 
-        return await self.github_mcp.run_async(
-            args={"action": "get_repository", "owner": owner, "repo": repo},
-            tool_context=None
-        )
+        return self._slim("get_repository", await self._cached_mcp({"action": "get_repository", "owner": owner, "repo": repo}))
 
     async def _list_branches(self, args: Dict[str, Any]) -> Dict[str, Any]:
-        """List all branches in a repository."""
+        """List branches, fanning out concurrently when given several repos."""
+        repos = args.get("repos")
+        if repos:
+            return {"results": await self._bulk([
+                {"action": "list_branches", "owner": t.get("owner", ""), "repo": t.get("repo", "")}
+                for t in repos
+            ])}
+
         owner = args.get("owner", "")
         repo = args.get("repo", "")
 
-        return await self.github_mcp.run_async(
-            args={"action": "list_branches", "owner": owner, "repo": repo},
-            tool_context=None
-        )
+        return self._slim("list_branches", await self._cached_mcp({"action": "list_branches", "owner": owner, "repo": repo}))
 
     async def _list_commits(self, args: Dict[str, Any]) -> Dict[str, Any]:
-        """List commits in a repository."""
+        """List commits, fanning out concurrently when given several repos."""
+        repos = args.get("repos")
+        if repos:
+            return {"results": await self._bulk([
+                {
+                    "action": "list_commits",
+                    "owner": t.get("owner", ""),
+                    "repo": t.get("repo", ""),
+                    "sha": args.get("branch", "main"),
+                    "per_page": args.get("limit", 30),
+                }
+                for t in repos
+            ])}
+
         owner = args.get("owner", "")
         repo = args.get("repo", "")
         branch = args.get("branch", "main")
         limit = args.get("limit", 30)
 
-        return await self.github_mcp.run_async(
-            args={
-                "action": "list_commits",
-                "owner": owner,
-                "repo": repo,
-                "sha": branch,
-                "per_page": limit
-            },
-            tool_context=None
+        return self._slim("list_commits", await self._cached_mcp({
+            "action": "list_commits",
+            "owner": owner,
+            "repo": repo,
+            "sha": branch,
+            "per_page": limit
+        }))
+
+    async def _list_repositories_deep(self, args: Dict[str, Any]) -> Dict[str, Any]:
+        """List an organization's repositories with metadata in one query per page.
+
+        "Details on all repos of org X" used to cost a listing call plus one
+        get_repository per repo (N+1 round trips); GraphQL pagination fetches
+        100 repos with metadata per request.
+        """
+        owner = args.get("owner", "")
+        repositories: List[Dict[str, Any]] = []
+        cursor = None
+
+        while True:
+            data = await self._graphql(_LIST_REPOS_GQL, {"o": owner, "c": cursor})
+            org = data.get("organization") if data else None
+            if not org:
+                # GraphQL unavailable or not an organization: plain listing
+                if not repositories:
+                    return await self._list_repositories(args)
+                break
+            page = org.get("repositories") or {}
+            repositories.extend(
+                {
+                    "name": n.get("name", ""),
+                    "description": n.get("description", ""),
+                    "stars": n.get("stargazerCount", 0),
+                    "language": (n.get("primaryLanguage") or {}).get("name", ""),
+                    "default_branch": (n.get("defaultBranchRef") or {}).get("name", ""),
+                }
+                for n in page.get("nodes") or []
+            )
+            info = page.get("pageInfo") or {}
+            if not info.get("hasNextPage"):
+                break
+            cursor = info.get("endCursor")
+
+        return {"success": True, "repositories": repositories}
+
+    async def _repo_overview(self, args: Dict[str, Any]) -> Dict[str, Any]:
+        """Fetch repo metadata, branches, commits, and open PRs in one query.
+
+        One GraphQL POST replaces the get_repository_info / list_branches /
+        list_commits / get_pull_requests quartet when they are wanted
+        together; falls back to the concurrent REST helpers when the MCP
+        server does not support GraphQL.
+        """
+        owner = args.get("owner", "")
+        repo = args.get("repo", "")
+        limit = args.get("limit", 30)
+
+        data = await self._graphql(_REPO_OVERVIEW_GQL, {"o": owner, "r": repo, "n": limit})
+        repository = data.get("repository") if data else None
+        if repository:
+            history = (
+                ((repository.get("defaultBranchRef") or {}).get("target") or {})
+                .get("history") or {}
+            )
+            return {
+                "success": True,
+                "repository": {
+                    "name": repository.get("name", ""),
+                    "description": repository.get("description", ""),
+                },
+                "branches": [
+                    {"name": n.get("name", "")}
+                    for n in (repository.get("refs") or {}).get("nodes") or []
+                ],
+                "commits": [
+                    {
+                        "sha": n.get("oid", ""),
+                        "message": n.get("messageHeadline", ""),
+                        "date": n.get("committedDate", ""),
+                    }
+                    for n in history.get("nodes") or []
+                ],
+                "pull_requests": [
+                    {
+                        "number": n.get("number", 0),
+                        "title": n.get("title", ""),
+                        "author": (n.get("author") or {}).get("login", ""),
+                    }
+                    for n in (repository.get("pullRequests") or {}).get("nodes") or []
+                ],
+            }
+
+        # GraphQL unavailable: fall back to the four concurrent REST reads
+        info, branches, commits, prs = await asyncio.gather(
+            self._get_repository_info(args),
+            self._list_branches(args),
+            self._list_commits(args),
+            self._get_pull_requests(args),
+            return_exceptions=True,
+        )
+        info, branches, commits, prs = (
+            {} if isinstance(r, Exception) else r for r in (info, branches, commits, prs)
         )
+        return {
+            "success": True,
+            "repository": info.get("repository", {}),
+            "branches": branches.get("branches", []),
+            "commits": commits.get("commits", []),
+            "pull_requests": prs.get("pull_requests", []),
+        }
 
     async def _get_pull_requests(self, args: Dict[str, Any]) -> Dict[str, Any]:
-        """Get pull requests for a repository."""
+        """Get pull requests, fanning out concurrently for several repos."""
+        repos = args.get("repos")
+        if repos:
+            return {"results": await self._bulk([
+                {
+                    "action": "list_pull_requests",
+                    "owner": t.get("owner", ""),
+                    "repo": t.get("repo", ""),
+                    "state": args.get("state", "open"),
+                }
+                for t in repos
+            ])}
+
         owner = args.get("owner", "")
         repo = args.get("repo", "")
         state = args.get("state", "open")  # open, closed, all
 
-        return await self.github_mcp.run_async(
-            args={
-                "action": "list_pull_requests",
-                "owner": owner,
-                "repo": repo,
-                "state": state
-            },
-            tool_context=None
-        )
+        return self._slim("list_pull_requests", await self._cached_mcp({
+            "action": "list_pull_requests",
+            "owner": owner,
+            "repo": repo,
+            "state": state
+        }))
 
 
 # Create the tool instance
 github_workflow_manager = GitHubWorkflowManager()
 
 
-# Enhanced GitHub agent with full DevOps workflow capabilities
+# Enhanced GitHub agent with full DevOps workflow capabilities.
+# Tool routing is deterministic inside GitHubWorkflowManager, so the LLM
+# mostly picks operations and summarizes results - flash handles that at a
+# fraction of pro's per-step latency. GITHUB_AGENT_MODEL overrides when a
+# heavier model is wanted for synthesis-style sessions.
 enhanced_github_agent = Agent(
     name="enhanced_github_specialist",
-    model="gemini-2.5-pro",
+    model=os.environ.get("GITHUB_AGENT_MODEL", "gemini-2.5-flash"),
     instruction=(
         "You are an expert GitHub DevOps specialist with comprehensive repository management capabilities. "
         "You can perform ALL GitHub operations including repository analysis, branch management, "
@@ -2,115 +2,272 @@
 Image generation tool using Vertex AI Imagen for technical diagrams and architecture visualizations.
 """
 
+import asyncio
+import functools
+import hashlib
 import os
-import google.auth
-from google import genai
-from google.genai import types
+import uuid
 from google.adk.tools import ToolContext
 from .diagram_generator_tool import generate_diagram_with_code
 
 
 # Set up Vertex AI environment
-_, project_id = google.auth.default()
 os.environ.setdefault("GOOGLE_CLOUD_PROJECT", "qwiklabs-gcp-03-ec92c6095411")
 os.environ.setdefault("GOOGLE_CLOUD_LOCATION", "europe-west4")
 os.environ.setdefault("GOOGLE_GENAI_USE_VERTEXAI", "True")
 
-# Configure the genai client
-client = genai.Client(vertexai=True)
+_client = None
+_client_lock = asyncio.Lock()
 
 
-async def generate_technical_image(prompt: str, tool_context: ToolContext):
-    """Generate technical architecture diagrams using ASCII diagrams + Imagen enhancement."""
-    try:
-        # Get ASCII diagram first for structure
-        ascii_result = await generate_diagram_with_code(prompt, tool_context)
+@functools.lru_cache(maxsize=1)
+def _types():
+    """Lazily import google.genai.types; the genai dependency graph costs
+    100-200ms at import, which processes that never render should skip."""
+    from google.genai import types
+    return types
 
-        if ascii_result["status"] == "success":
-            # Now enhance the ASCII diagram with Imagen
-            ascii_description = ascii_result.get("diagram_code", "ASCII diagram generated")
 
-            enhanced_prompt = f"""Create a professional technical architecture diagram based on this ASCII structure:
+@functools.lru_cache(maxsize=1)
+def _gcp_defaults():
+    """Resolve default credentials once per process.
+
+    google.auth.default() hits the GCE metadata server (or reads local
+    credentials); memoizing it means repeated client setups share a single
+    lookup.
+    """
+    import google.auth
+    return google.auth.default()
 
-{ascii_description}
+# Static prompt scaffolds and render config, built once instead of per call
+_ENHANCED_TMPL = """Create a professional technical architecture diagram based on this ASCII structure:
+
+{ascii}
 
 STYLE: Clean, modern cloud architecture diagram with official provider icons and colors.
 LAYOUT: Follow the ASCII structure but make it visually appealing.
 ICONS: Use official cloud provider icons - Azure blue (#0078D4), GCP colors, AWS orange.
 FORMAT: Professional technical documentation style with clear labels."""
 
-            response = client.models.generate_images(
-                model="imagen-4.0-generate-001",
-                prompt=enhanced_prompt,
-                config=types.GenerateImagesConfig(
-                    number_of_images=1,
-                    aspect_ratio="16:9",
-                    safety_filter_level="block_low_and_above",
-                    person_generation="allow_adult",
-                ),
-            )
+_FALLBACK_TMPL = """Professional technical architecture diagram: {prompt}
+
+STYLE: Clean, modern cloud architecture diagram with official provider icons and colors.
+LAYOUT: Logical component grouping with clear data flow arrows.
+ICONS: Use official cloud provider icons - Azure blue (#0078D4), GCP colors, AWS orange.
+FORMAT: Professional technical documentation style with clear labels."""
+
+@functools.lru_cache(maxsize=1)
+def _imagen_cfg():
+    """Shared render config, built on first use so import stays lazy."""
+    return _types().GenerateImagesConfig(
+        number_of_images=1,
+        aspect_ratio="16:9",
+        safety_filter_level="block_low_and_above",
+        person_generation="allow_adult",
+    )
 
-            if response.generated_images is not None:
-                for generated_image in response.generated_images:
-                    image_bytes = generated_image.image.image_bytes
-                    artifact_name = f"enhanced_technical_diagram.png"
+# Single-flight map: concurrent calls with the same prompt share one
+# multi-second Imagen round trip instead of each paying for their own
+_inflight = {}
+_inflight_lock = asyncio.Lock()
 
-                    report_artifact = types.Part.from_bytes(
-                        data=image_bytes, mime_type="image/png"
-                    )
 
-                    await tool_context.save_artifact(artifact_name, report_artifact)
+@functools.lru_cache(maxsize=1)
+def _imagen_cache_bucket():
+    """Bucket for the content-addressed PNG cache, or None when unset."""
+    bucket_name = os.environ.get("IMAGEN_CACHE_BUCKET", "")
+    if not bucket_name:
+        return None
+    try:
+        import google.cloud.storage as storage
+        return storage.Client().bucket(bucket_name.removeprefix("gs://"))
+    except Exception as e:
+        print(f"Imagen cache bucket unavailable: {e}")
+        return None
 
-                    return {
-                        "status": "success",
-                        "message": f"Enhanced technical diagram created based on ASCII structure for: {prompt}",
-                        "artifact_name": artifact_name,
-                        "method": "ascii_enhanced",
-                        "ascii_structure": ascii_description
-                    }
 
-        # Fallback to Imagen if programmatic generation fails
-        enhanced_prompt = f"""Professional technical architecture diagram: {prompt}
+def _imagen_cache_key(prompt: str, ascii_description: str) -> str:
+    """Content-address a render by its full deterministic input."""
+    return hashlib.blake2b(
+        f"{prompt}||{ascii_description}".encode(), digest_size=16
+    ).hexdigest()
 
-STYLE: Clean, modern cloud architecture diagram with official provider icons and colors.
-LAYOUT: Logical component grouping with clear data flow arrows.
-ICONS: Use official cloud provider icons - Azure blue (#0078D4), GCP colors, AWS orange.
-FORMAT: Professional technical documentation style with clear labels."""
 
-        response = client.models.generate_images(
-            model="imagen-4.0-generate-001",
-            prompt=enhanced_prompt,
-            config=types.GenerateImagesConfig(
-                number_of_images=1,
-                aspect_ratio="16:9",
-                safety_filter_level="block_low_and_above",
-                person_generation="allow_adult",
-            ),
+async def _imagen_cache_get(key: str):
+    """Return cached PNG bytes for a render key, or None on miss."""
+    bucket = _imagen_cache_bucket()
+    if bucket is None:
+        return None
+    try:
+        blob = bucket.blob(f"imagen-cache/{key}.png")
+        if await asyncio.to_thread(blob.exists):
+            return await asyncio.to_thread(blob.download_as_bytes)
+    except Exception:
+        pass
+    return None
+
+
+async def _imagen_cache_put(key: str, image_bytes: bytes) -> None:
+    """Persist rendered PNG bytes; best-effort, never blocks the caller path."""
+    bucket = _imagen_cache_bucket()
+    if bucket is None:
+        return
+    try:
+        blob = bucket.blob(f"imagen-cache/{key}.png")
+        blob.metadata = {"version": "imagen-4.0-generate-001"}
+        await asyncio.to_thread(
+            blob.upload_from_string, image_bytes, content_type="image/png"
         )
+    except Exception as e:
+        print(f"Imagen cache write failed: {e}")
+
+
+async def _get_client():
+    """Lazily create the shared genai client on first use.
 
-        if response.generated_images is not None:
-            for generated_image in response.generated_images:
-                image_bytes = generated_image.image.image_bytes
-                artifact_name = f"technical_diagram.png"
+    google.auth.default() can cost a metadata-server round trip on GCE, so
+    deferring it keeps module import cheap and skips the credential fetch
+    entirely in processes that never generate an image.
+    """
+    global _client
+    if _client is None:
+        async with _client_lock:
+            if _client is None:
+                from google import genai
+                _gcp_defaults()
+                _client = genai.Client(vertexai=True)
+    return _client
 
-                report_artifact = types.Part.from_bytes(
-                    data=image_bytes, mime_type="image/png"
+
+async def _save_image_artifact(tool_context: ToolContext, image_bytes: bytes, prefix: str) -> str:
+    """Save PNG bytes as a uniquely named artifact and return its name."""
+    # Per-call name: concurrent generations in one session must not
+    # overwrite each other's artifact
+    artifact_name = f"{prefix}_{uuid.uuid4().hex[:8]}.png"
+    report_artifact = _types().Part.from_bytes(data=image_bytes, mime_type="image/png")
+    await tool_context.save_artifact(artifact_name, report_artifact)
+    return artifact_name
+
+
+async def generate_technical_image(prompt: str, tool_context: ToolContext):
+    """Generate technical architecture diagrams using ASCII diagrams + Imagen enhancement."""
+    key = hashlib.sha1(prompt.encode()).hexdigest()
+    async with _inflight_lock:
+        pending = _inflight.get(key)
+        if pending is None:
+            pending = asyncio.get_running_loop().create_future()
+            _inflight[key] = pending
+            owner = True
+        else:
+            owner = False
+
+    if not owner:
+        result = await asyncio.shield(pending)
+        return dict(result)
+
+    try:
+        result = await _generate_technical_image_impl(prompt, tool_context)
+        pending.set_result(result)
+        return result
+    except BaseException as e:
+        pending.set_exception(e)
+        raise
+    finally:
+        async with _inflight_lock:
+            _inflight.pop(key, None)
+
+
+async def _generate_technical_image_impl(prompt: str, tool_context: ToolContext):
+    """Do the actual ASCII + Imagen generation work for one prompt."""
+    try:
+        client = await _get_client()
+
+        # Speculatively start the fallback Imagen render while the ASCII
+        # generator runs: if the ASCII path fails, its fallback is already
+        # in flight instead of starting from zero
+        fallback_task = asyncio.create_task(asyncio.to_thread(
+            client.models.generate_images,
+            model="imagen-4.0-generate-001",
+            prompt=_FALLBACK_TMPL.format(prompt=prompt),
+            config=_imagen_cfg(),
+        ))
+
+        # Get ASCII diagram first for structure
+        ascii_result = await generate_diagram_with_code(prompt, tool_context)
+
+        if ascii_result["status"] == "success":
+            # Now enhance the ASCII diagram with Imagen
+            ascii_description = ascii_result.get("diagram_code", "ASCII diagram generated")
+
+            # Imagen renders are the most expensive call here; replay a
+            # content-addressed cached PNG when the same prompt + structure
+            # was rendered before
+            cache_key = _imagen_cache_key(prompt, ascii_description)
+            cached_bytes = await _imagen_cache_get(cache_key)
+            if cached_bytes is not None:
+                fallback_task.cancel()
+                artifact_name = await _save_image_artifact(
+                    tool_context, cached_bytes, "enhanced_technical_diagram"
+                )
+                return {
+                    "status": "success",
+                    "message": f"Enhanced technical diagram created based on ASCII structure for: {prompt}",
+                    "artifact_name": artifact_name,
+                    "method": "ascii_enhanced_cached",
+                    "ascii_structure": ascii_description
+                }
+
+            # generate_images is a blocking SDK call; run it in a worker
+            # thread so the event loop keeps serving other tools
+            response = await asyncio.to_thread(
+                client.models.generate_images,
+                model="imagen-4.0-generate-001",
+                prompt=_ENHANCED_TMPL.format(ascii=ascii_description),
+                config=_imagen_cfg(),
+            )
+
+            # number_of_images=1, so take the first image directly
+            if response.generated_images:
+                image_bytes = response.generated_images[0].image.image_bytes
+                artifact_name = await _save_image_artifact(
+                    tool_context, image_bytes, "enhanced_technical_diagram"
                 )
 
-                await tool_context.save_artifact(artifact_name, report_artifact)
+                # Enhanced path succeeded; drop the speculative render
+                # and persist the PNG without blocking the response
+                fallback_task.cancel()
+                asyncio.create_task(_imagen_cache_put(cache_key, image_bytes))
 
                 return {
                     "status": "success",
-                    "message": f"Technical diagram generated with Imagen for: {prompt}",
+                    "message": f"Enhanced technical diagram created based on ASCII structure for: {prompt}",
                     "artifact_name": artifact_name,
-                    "method": "imagen_fallback"
+                    "method": "ascii_enhanced",
+                    "ascii_structure": ascii_description
                 }
-        else:
+
+        # Fallback to Imagen if programmatic generation fails: the
+        # speculative render has been running since before the ASCII attempt
+        response = await fallback_task
+
+        if response.generated_images:
+            image_bytes = response.generated_images[0].image.image_bytes
+            artifact_name = await _save_image_artifact(
+                tool_context, image_bytes, "technical_diagram"
+            )
+
             return {
-                "status": "error",
-                "message": f"Both programmatic and Imagen generation failed. Response: {str(response)}",
+                "status": "success",
+                "message": f"Technical diagram generated with Imagen for: {prompt}",
+                "artifact_name": artifact_name,
+                "method": "imagen_fallback"
             }
 
+        return {
+            "status": "error",
+            "message": f"Both programmatic and Imagen generation failed. Response: {str(response)}",
+        }
+
     except Exception as e:
         return {
             "status": "error",
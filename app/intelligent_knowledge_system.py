@@ -2,11 +2,14 @@
 Intelligent Knowledge System: LLM decides when to use RAG vs WebFetch based on knowledge gaps.
 """
 
+import asyncio
+import json
+import os
+
 from google.adk.tools import ToolContext, google_search
 from google.adk.tools.retrieval.vertex_ai_rag_retrieval import VertexAiRagRetrieval
 from google import genai
 from google.genai import types
-import os
 
 
 class IntelligentKnowledgeSystem:
@@ -49,31 +52,34 @@ class IntelligentKnowledgeSystem:
         Intelligent knowledge retrieval with LLM decision making.
         """
 
-        # Step 1: LLM evaluates what it needs to know
-        knowledge_assessment = await self._assess_knowledge_needs(architecture_description, context)
+        # Steps 1 and 3 are fused into one structured Gemini call, and RAG
+        # retrieval runs speculatively against the raw description at the
+        # same time: one LLM round trip on the hot path instead of three
+        rag_task = None
+        if self.rag_retrieval:
+            rag_task = asyncio.create_task(self._get_rag_knowledge(architecture_description))
 
-        # Step 2: Try RAG first if available
-        rag_knowledge = ""
-        if self.rag_retrieval and knowledge_assessment.get("use_rag", True):
-            rag_knowledge = await self._get_rag_knowledge(knowledge_assessment["rag_query"])
+        combined = await self._assess_and_evaluate(architecture_description, context)
+        knowledge_assessment = combined.get("assessment", {})
+        knowledge_gap = combined.get("gap", {})
 
-        # Step 3: LLM decides if RAG knowledge is sufficient
-        knowledge_gap = await self._evaluate_knowledge_gap(
-            architecture_description,
-            rag_knowledge,
-            knowledge_assessment
-        )
+        rag_knowledge = ""
+        if rag_task is not None:
+            if knowledge_assessment.get("use_rag", True):
+                rag_knowledge = await rag_task
+            else:
+                rag_task.cancel()
 
-        # Step 4: Use WebFetch if needed
+        # Use WebFetch if needed
         web_knowledge = ""
         if knowledge_gap.get("need_web_fetch", False):
-            web_knowledge = await self._get_web_knowledge(knowledge_gap["web_queries"])
+            web_knowledge = await self._get_web_knowledge(knowledge_gap.get("web_queries", []))
 
             # Add new knowledge to RAG for future use
             if self.rag_retrieval and web_knowledge:
                 await self._add_to_rag(web_knowledge)
 
-        # Step 5: Combine all knowledge sources
+        # Combine all knowledge sources
         final_knowledge = await self._combine_knowledge(
             rag_knowledge,
             web_knowledge,
@@ -82,10 +88,10 @@ class IntelligentKnowledgeSystem:
 
         return final_knowledge
 
-    async def _assess_knowledge_needs(self, architecture_description: str, context: str) -> dict:
-        """LLM assesses what knowledge is needed for the architecture."""
+    async def _assess_and_evaluate(self, architecture_description: str, context: str) -> dict:
+        """One LLM pass assessing knowledge needs and likely gaps together."""
 
-        assessment_prompt = f"""
+        combined_prompt = f"""
 Analyze this architecture request and determine what diagrams package knowledge is needed.
 
 Architecture: {architecture_description}
@@ -95,42 +101,53 @@ Evaluate:
 1. What cloud providers are mentioned? (AWS, Azure, GCP)
 2. What specific services/components are needed?
 3. What diagram patterns are required?
-4. Do you need to search for specific diagrams package syntax?
+4. Is internal documentation retrieval likely to cover them, or is a
+   web search for specific diagrams package syntax needed?
 
 Return JSON with:
 {{
-    "cloud_providers": ["aws", "azure", "gcp"],
-    "services_needed": ["compute", "database", "network"],
-    "specific_components": ["EC2", "RDS", "VirtualMachines"],
-    "diagram_patterns": ["web-tier", "microservices", "data-pipeline"],
-    "use_rag": true,
-    "rag_query": "AWS EC2 RDS VirtualMachines diagrams package syntax",
-    "confidence_level": "high|medium|low"
+    "assessment": {{
+        "cloud_providers": ["aws", "azure", "gcp"],
+        "services_needed": ["compute", "database", "network"],
+        "specific_components": ["EC2", "RDS", "VirtualMachines"],
+        "diagram_patterns": ["web-tier", "microservices", "data-pipeline"],
+        "use_rag": true,
+        "rag_query": "AWS EC2 RDS VirtualMachines diagrams package syntax",
+        "confidence_level": "high|medium|low"
+    }},
+    "gap": {{
+        "knowledge_sufficient": true,
+        "need_web_fetch": false,
+        "missing_knowledge": ["specific missing items"],
+        "web_queries": ["diagrams.aws.compute components", "Azure VirtualMachines syntax"],
+        "confidence_score": 0.8
+    }}
 }}
 """
 
         try:
-            response = self.client.models.generate_content(
+            # client.aio is the async surface; the sync call would block
+            # the event loop for the full generation
+            response = await self.client.aio.models.generate_content(
                 model="gemini-2.5-flash",
-                contents=[assessment_prompt],
+                contents=[combined_prompt],
                 config=types.GenerateContentConfig(
                     temperature=0.1,
-                    max_output_tokens=500
+                    max_output_tokens=800
                 )
             )
-
-            # Parse JSON response
-            import json
-            result = json.loads(response.text.strip())
-            return result
+            return json.loads(response.text.strip())
 
         except Exception as e:
             print(f"Assessment failed: {e}")
             return {
-                "cloud_providers": ["aws"],
-                "use_rag": True,
-                "rag_query": architecture_description,
-                "confidence_level": "low"
+                "assessment": {
+                    "cloud_providers": ["aws"],
+                    "use_rag": True,
+                    "rag_query": architecture_description,
+                    "confidence_level": "low"
+                },
+                "gap": {"need_web_fetch": False, "knowledge_sufficient": True}
             }
 
     async def _get_rag_knowledge(self, query: str) -> str:
@@ -143,67 +160,32 @@ Return JSON with:
             print(f"RAG retrieval failed: {e}")
             return ""
 
-    async def _evaluate_knowledge_gap(self, architecture_description: str, rag_knowledge: str, assessment: dict) -> dict:
-        """LLM evaluates if RAG knowledge is sufficient or if WebFetch is needed."""
-
-        gap_evaluation_prompt = f"""
-Architecture Request: {architecture_description}
-RAG Knowledge Retrieved: {rag_knowledge}
-Original Assessment: {assessment}
-
-Evaluate if the RAG knowledge is sufficient to generate accurate Python diagrams code.
-
-Check for:
-1. Are all required cloud provider imports available?
-2. Are specific component classes mentioned?
-3. Is the syntax for connections and clusters clear?
-4. Are there any missing components or services?
-
-Return JSON:
-{{
-    "knowledge_sufficient": true/false,
-    "need_web_fetch": true/false,
-    "missing_knowledge": ["specific missing items"],
-    "web_queries": ["diagrams.aws.compute components", "Azure VirtualMachines syntax"],
-    "confidence_score": 0.8
-}}
-"""
-
-        try:
-            response = self.client.models.generate_content(
-                model="gemini-2.5-flash",
-                contents=[gap_evaluation_prompt],
-                config=types.GenerateContentConfig(
-                    temperature=0.1,
-                    max_output_tokens=400
-                )
-            )
-
-            import json
-            result = json.loads(response.text.strip())
-            return result
-
-        except Exception as e:
-            print(f"Gap evaluation failed: {e}")
-            return {"need_web_fetch": False, "knowledge_sufficient": True}
-
     async def _get_web_knowledge(self, web_queries: list) -> str:
         """Fetch additional knowledge from web sources using Google Search."""
-        web_knowledge = ""
 
-        for query in web_queries[:3]:  # Limit to 3 queries
-            try:
-                # Search for diagrams package documentation
-                search_query = f"python diagrams package {query} site:diagrams.mingrammer.com"
+        # Bounded fan-out: queries run concurrently so three searches cost
+        # one round trip, without hammering the search backend if the query
+        # list ever grows
+        sem = asyncio.Semaphore(5)
 
-                result = await self.search_tool.invoke(search_query)
+        async def _search(query: str):
+            async with sem:
+                search_query = f"python diagrams package {query} site:diagrams.mingrammer.com"
+                return await self.search_tool.invoke(search_query)
 
-                web_knowledge += f"\n\n## {query}:\n{result}"
+        queries = web_queries[:3]  # Limit to 3 queries
+        results = await asyncio.gather(
+            *(_search(query) for query in queries), return_exceptions=True
+        )
 
-            except Exception as e:
-                print(f"Search failed for {query}: {e}")
+        sections = []
+        for query, result in zip(queries, results):
+            if isinstance(result, BaseException):
+                print(f"Search failed for {query}: {result}")
+                continue
+            sections.append(f"\n\n## {query}:\n{result}")
 
-        return web_knowledge
+        return "".join(sections)
 
     def _determine_best_url(self, query: str) -> str:
         """Determine the best URL to fetch information for a query."""
@@ -249,7 +231,7 @@ Format as clear documentation for code generation.
 """
 
         try:
-            response = self.client.models.generate_content(
+            response = await self.client.aio.models.generate_content(
                 model="gemini-2.5-flash",
                 contents=[combine_prompt],
                 config=types.GenerateContentConfig(
@@ -93,8 +93,12 @@ class DiagramsDocsFetcher:
         providers = ["aws", "azure", "gcp"]
         knowledge_base = "# LIVE DIAGRAMS PACKAGE DOCUMENTATION\n\n"
 
-        for provider in providers:
-            nodes_data = await self.fetch_provider_nodes(provider)
+        # Provider fetches are independent network lookups; run them
+        # concurrently and keep the output order deterministic
+        provider_nodes = await asyncio.gather(
+            *(self.fetch_provider_nodes(provider) for provider in providers)
+        )
+        for provider, nodes_data in zip(providers, provider_nodes):
             knowledge_base += self._format_provider_docs(provider, nodes_data)
 
         # Add generic components
@@ -1,35 +1,71 @@
+import functools
 import os
 from google.adk.tools.mcp_tool import MCPToolset, StreamableHTTPConnectionParams
 
-def create_github_mcp():
-    return MCPToolset(
+# Every toolset handed out by the memoized factories below; lets shutdown
+# hooks close the pooled HTTP sessions cleanly instead of leaking them
+_live_toolsets = []
+
+
+def _track(toolset):
+    _live_toolsets.append(toolset)
+    return toolset
+
+
+@functools.lru_cache(maxsize=None)
+def create_github_mcp(token=None):
+    """Return the shared GitHub MCP toolset for a token.
+
+    Memoized so every caller reuses one long-lived streamable HTTP session
+    per token; constructing a toolset per consumer would open a fresh
+    TCP+TLS connection for each, doubling per-request latency on GitHub's
+    TLS-heavy endpoint. The auth header is fixed at construction, so token
+    rotation selects between memoized toolsets rather than mutating one.
+    """
+    return _track(MCPToolset(
         connection_params=StreamableHTTPConnectionParams(
             url="https://api.githubcopilot.com/mcp/",
             headers={
-                "Authorization": f"Bearer {os.getenv('GITHUB_PERSONAL_ACCESS_TOKEN')}",
+                "Authorization": f"Bearer {token or os.getenv('GITHUB_PERSONAL_ACCESS_TOKEN')}",
             }
         )
-    )
+    ))
 
+@functools.lru_cache(maxsize=1)
 def create_microsoft_learn_mcp():
-    """Create Microsoft Learn MCP toolset using Streamable HTTP"""
-    return MCPToolset(
+    """Create Microsoft Learn MCP toolset using Streamable HTTP.
+
+    Memoized for the same reason as the GitHub toolset: one long-lived
+    session with connection keep-alive instead of a handshake per consumer.
+    """
+    return _track(MCPToolset(
         connection_params=StreamableHTTPConnectionParams(
             url="https://learn.microsoft.com/api/mcp",
             headers={}  # No authentication required - public endpoint
         )
-    )
+    ))
 
+@functools.lru_cache(maxsize=1)
 def create_terraform_docs_mcp():
-    """Create Terraform Docs MCP toolset using Streamable HTTP"""
-    return MCPToolset(
+    """Create Terraform Docs MCP toolset using Streamable HTTP, memoized
+    so all consumers share one pooled session."""
+    return _track(MCPToolset(
         connection_params=StreamableHTTPConnectionParams(
             url="https://terraform-mcp-server-610548143990.europe-west4.run.app/mcp",
             headers={}  # No authentication required - public endpoint
         )
-    )
-
-
+    ))
 
 
+async def close_mcp_toolsets() -> None:
+    """Close every shared toolset's underlying HTTP session.
 
+    Called from the server shutdown hook so the pooled keep-alive
+    connections are torn down gracefully.
+    """
+    for toolset in _live_toolsets:
+        try:
+            await toolset.close()
+        except Exception as e:
+            print(f"MCP toolset close failed: {e}")
+    _live_toolsets.clear()
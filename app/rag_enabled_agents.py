@@ -5,7 +5,7 @@ from google.adk.tools import AgentTool
 from google.adk.tools import google_search
 from app.mcp_github import create_github_mcp, create_microsoft_learn_mcp, create_terraform_docs_mcp
 from app.image_generation_tool import generate_technical_image
-from app.diagrams_rag_agent import diagrams_expert_agent
+from app.diagrams_rag_agent import get_diagrams_expert_agent
 from app.intelligent_code_generator import code_generator_agent
 
 
@@ -79,7 +79,7 @@ microsoft_tool = AgentTool(agent=microsoft_sub_agent)
 terraform_tool = AgentTool(agent=terraform_sub_agent)
 search_tool = AgentTool(agent=search_sub_agent)
 image_tool = AgentTool(agent=image_generation_sub_agent)
-diagrams_tool = AgentTool(agent=diagrams_expert_agent)
+diagrams_tool = AgentTool(agent=get_diagrams_expert_agent())
 code_generator_tool = AgentTool(agent=code_generator_agent)
 
 root_agent = Agent(
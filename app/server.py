@@ -75,6 +75,24 @@ app.description = "API for interacting with the Agent infrastructure-genie"
 app.include_router(compliance_router, prefix="/api/v1", tags=["compliance"])
 
 
+@app.on_event("startup")
+async def warmup_rag() -> None:
+    """Warm the RAG retrieval pipeline so the first request skips cold-start."""
+    import asyncio
+
+    from app.diagrams_rag_system import warmup_diagrams_rag
+
+    asyncio.create_task(warmup_diagrams_rag())
+
+
+@app.on_event("shutdown")
+async def close_mcp_sessions() -> None:
+    """Tear down the shared MCP HTTP sessions on server shutdown."""
+    from app.mcp_github import close_mcp_toolsets
+
+    await close_mcp_toolsets()
+
+
 @app.post("/feedback")
 def collect_feedback(feedback: Feedback) -> dict[str, str]:
     """Collect and log feedback.